@@ -1,33 +1,63 @@
+import io
 import os
+import zipfile
+import email
+import email.policy
+import csv
+import pickle
+import hashlib
+import importlib
 import sys
 import re
+import json
+import time
+import asyncio
+import heapq
+import itertools
+import multiprocessing
+import queue
 import shutil
+import socket
 import logging
 import threading
+import unicodedata
 from pathlib import Path
-from collections import namedtuple, defaultdict, Counter
+from collections import namedtuple, Counter, OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Optional imports
 try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    PdfReader = None
-
-try:
-    from docx import Document
-except ImportError:
-    Document = None
-
-try:
-    import ahocorasick
-except ImportError:
-    ahocorasick = None
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s', stream=sys.stdout)
 logger = logging.getLogger(__name__)
 
 Client = namedtuple("Client", ["first", "middle", "last"])
+# ``member`` is set for a document inside a ZIP or EML container at ``path``;
+# ``size`` is then the member's size and ``mtime`` the container's.
+FileEntry = namedtuple("FileEntry", ["path", "size", "mtime", "member"], defaults=(None,))
+
+CONFIG_DIR = Path.home() / ".LawyerFileOrganizer"
+
+# Optional backends (PyPDF2, python-docx, pyahocorasick) are heavy to import,
+# so they are loaded on first use rather than at module import.
+_backends = {}
+_backends_lock = threading.Lock()
+
+def load_backend(module_name):
+    """Import an optional backend module on first use; returns None if it is not installed."""
+    try:
+        return _backends[module_name]
+    except KeyError:
+        pass
+    with _backends_lock:
+        if module_name not in _backends:
+            try:
+                _backends[module_name] = importlib.import_module(module_name)
+            except ImportError:
+                _backends[module_name] = None
+        return _backends[module_name]
 
 
 
@@ -38,60 +68,605 @@ def get_client_display_name(client: Client) -> str:
     else:
         return f"{client.first.capitalize()} {client.last.capitalize()}"
 
+VALID_EXTENSIONS = (".pdf", ".docx", ".txt", ".png", ".js", ".json")
+ARCHIVE_EXTENSIONS = (".zip", ".eml")
+_DISCOVERED_EXTENSIONS = VALID_EXTENSIONS + ARCHIVE_EXTENSIONS
+
 def has_valid_extension(file_path):
-    return file_path.suffix.lower() in [".pdf", ".docx", ".txt",".png",".js",".json"]
+    return file_path.suffix.lower() in VALID_EXTENSIONS
 
 def extract_text(file_path):
     ext = file_path.suffix.lower()
+    if ext not in TEXT_EXTENSIONS:
+        return ""
+    try:
+        data = file_path.read_bytes()
+    except OSError:
+        return ""
+    return extract_text_from_bytes(data, ext)
+
+def extract_text_from_bytes(data, ext):
+    """Extract text from an in-memory document, so reading and parsing can run in separate stages."""
     try:
-        if ext == ".txt":
-            return file_path.read_text(encoding='utf-8', errors='ignore')
-        elif ext == ".pdf" and PdfReader:
-            with open(file_path, "rb") as f:
-                reader = PdfReader(f)
-                return "\n".join(page.extract_text() or '' for page in reader.pages)
-        elif ext == ".docx" and Document:
-            doc = Document(file_path)
-            return "\n".join(para.text for para in doc.paragraphs)
+        return _parse_document(data, ext)
     except Exception:
         return ""
-    return ""
+
+def _parse_document(data, ext):
+    extractor = EXTRACTORS.get(ext)
+    return extractor(data) if extractor else ""
+
+def _extract_txt(data):
+    return data.decode('utf-8', errors='ignore')
+
+def _extract_pdf(data):
+    PyPDF2 = load_backend("PyPDF2")
+    if PyPDF2 is None:
+        return ""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or '' for page in reader.pages)
+
+def _extract_docx(data):
+    docx = load_backend("docx")
+    if docx is None:
+        return ""
+    doc = docx.Document(io.BytesIO(data))
+    return "\n".join(para.text for para in doc.paragraphs)
+
+EXTRACTORS = {".txt": _extract_txt, ".pdf": _extract_pdf, ".docx": _extract_docx}
+TEXT_EXTENSIONS = tuple(EXTRACTORS)
+
+# Region-prioritized extraction: the parts of a document most likely to name the
+# client (caption, letterhead, "Re:" line) are the "head" and are parsed and
+# matched first; the "body" is only parsed when the head names nobody.
+# Each part is a list of (region, text) in the order it should be matched.
+DEFAULT_REGION_LIMITS = {'pdf_pages': 1, 'docx_paragraphs': 20, 'text_kb': 16}
+
+def extract_regions(data, ext, part, limits=None):
+    try:
+        return _parse_regions(data, ext, part, limits)
+    except Exception:
+        return []
+
+def _parse_regions(data, ext, part, limits=None):
+    extractor = REGION_EXTRACTORS.get(ext)
+    return extractor(data, part, dict(DEFAULT_REGION_LIMITS, **(limits or {}))) if extractor else []
+
+def _txt_regions(data, part, limits):
+    cut = limits['text_kb'] * 1024
+    if cut < len(data):
+        # Cut after the last whitespace so no word straddles the two parts.
+        space = max(data.rfind(ch, 0, cut) for ch in (b" ", b"\n", b"\t"))
+        cut = space + 1 if space > 0 else cut
+    if part == 'head':
+        return [("opening", _extract_txt(data[:cut]))]
+    return [("body", _extract_txt(data[cut:]))] if cut < len(data) else []
+
+def _pdf_regions(data, part, limits):
+    PyPDF2 = load_backend("PyPDF2")
+    if PyPDF2 is None:
+        return []
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    count = len(reader.pages)
+    first = min(limits['pdf_pages'], count)
+    pages = range(first) if part == 'head' else range(first, count)
+    if not pages:
+        return []
+    return [("first_pages" if part == 'head' else "body",
+             "\n".join(reader.pages[i].extract_text() or '' for i in pages))]
+
+def _docx_regions(data, part, limits):
+    docx = load_backend("docx")
+    if docx is None:
+        return []
+    doc = docx.Document(io.BytesIO(data))
+    first = limits['docx_paragraphs']
+    if part == 'head':
+        header_text = "\n".join(
+            para.text
+            for section in doc.sections
+            for block in (section.header, section.first_page_header, section.footer)
+            for para in block.paragraphs)
+        return [("header", header_text),
+                ("opening", "\n".join(para.text for para in doc.paragraphs[:first]))]
+    return [("body", "\n".join(para.text for para in doc.paragraphs[first:]))]
+
+REGION_EXTRACTORS = {".txt": _txt_regions, ".pdf": _pdf_regions, ".docx": _docx_regions}
+
+
+# Formats parsed by third-party libraries that can hang or balloon on malformed input.
+SANDBOXED_EXTENSIONS = (".pdf", ".docx")
+DEFAULT_EXTRACT_TIMEOUT = 120
+DEFAULT_EXTRACT_MEMORY_MB = 1024
+DEFAULT_EXTRACT_RECYCLE_AFTER = 200
+# Seconds a finished run waits for threads whose timed-out parse was ended by closing the sandbox.
+SANDBOX_SETTLE_TIMEOUT = 5
+
+
+class ExtractionSandboxError(Exception):
+    """A document made its sandbox worker time out, run out of memory or crash."""
+
+
+def _sandbox_main(conn, memory_limit, profile_interval=None):
+    if resource and memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    # When the run is profiled, sample this process's parsing and send the
+    # samples back with each result for the parent's profiler to merge.
+    profiler = parsing = None
+    if profile_interval:
+        parsing = threading.Event()
+        profiler = SamplingProfiler(profile_interval, ("MainThread",), active=parsing)
+        profiler.start()
+    while True:
+        try:
+            ext, data, part, limits = conn.recv()
+        except EOFError:
+            return
+        if parsing is not None:
+            parsing.set()
+        try:
+            if part is None:
+                result = ('ok', _parse_document(data, ext))
+            else:
+                result = ('ok', _parse_regions(data, ext, part, limits))
+        except MemoryError:
+            conn.send(('error', "memory limit exceeded", None))
+            return
+        except Exception:
+            result = ('ok', "" if part is None else [])
+        finally:
+            if parsing is not None:
+                parsing.clear()
+        conn.send((*result, profiler.drain() if profiler else None))
+
+
+class _SandboxWorker:
+    __slots__ = ("process", "conn", "tasks")
+
+    def __init__(self, ctx, memory_limit, profile_interval=None):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_sandbox_main, args=(child_conn, memory_limit, profile_interval),
+                                   daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def kill(self):
+        self.conn.close()
+        self.process.kill()
+        self.process.join()
+
+
+class ExtractionSandbox:
+    """Pool of recyclable worker processes that parse documents under a wall-clock and memory cap.
+
+    Each call borrows one worker. A worker that times out, exceeds RLIMIT_AS
+    (POSIX only) or dies is killed and replaced on next use, and workers are
+    recycled after ``recycle_after`` documents to shed leaked memory. With a
+    SamplingProfiler set as ``profiler``, workers sample their own parsing
+    and the samples are merged into it.
+    """
+
+    def __init__(self, workers, timeout=DEFAULT_EXTRACT_TIMEOUT, memory_limit_mb=DEFAULT_EXTRACT_MEMORY_MB,
+                 recycle_after=DEFAULT_EXTRACT_RECYCLE_AFTER):
+        self.timeout = timeout
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.recycle_after = recycle_after
+        self._ctx = multiprocessing.get_context('spawn')
+        self._idle = queue.LifoQueue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.profiler = None
+        for _ in range(workers):
+            self._idle.put(None)
+
+    def _spawn(self):
+        worker = _SandboxWorker(self._ctx, self.memory_limit, self.profiler.interval if self.profiler else None)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.kill()
+
+    def extract(self, data, ext, part=None, region_limits=None):
+        """Return the document's text, or with ``part`` its (region, text) list as extract_regions() would."""
+        worker = self._idle.get()
+        try:
+            if self._closed:
+                raise ExtractionSandboxError("sandbox closed")
+            if worker is not None and worker.tasks >= self.recycle_after:
+                self._discard(worker)
+                worker = None
+            if worker is None:
+                worker = self._spawn()
+            worker.tasks += 1
+            try:
+                worker.conn.send((ext, data, part, region_limits))
+                if not worker.conn.poll(self.timeout):
+                    raise ExtractionSandboxError(f"no result after {self.timeout}s")
+                status, payload, samples = worker.conn.recv()
+                if samples and self.profiler is not None:
+                    self.profiler.merge(samples)
+            except (EOFError, OSError) as e:
+                raise ExtractionSandboxError(f"parser process crashed ({e.__class__.__name__})")
+            except ExtractionSandboxError:
+                raise
+            if status != 'ok':
+                raise ExtractionSandboxError(payload)
+            return payload
+        except ExtractionSandboxError:
+            if worker is not None:
+                self._discard(worker)
+                worker = None
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers, self._workers = list(self._workers), set()
+        for worker in workers:
+            worker.kill()
+
+
+DEFAULT_EXTRACTION_CACHE_MB = 256
+
+class ExtractionCache:
+    """Thread-safe LRU of extracted text, keyed by (path, size, mtime).
+
+    Shared across runs by a long-lived process (see Fileorganizer_service), so
+    a file that has not changed is never read or parsed twice.
+    """
+
+    def __init__(self, max_mb=DEFAULT_EXTRACTION_CACHE_MB):
+        self.max_chars = max_mb * 1024 * 1024
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self._texts = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(entry):
+        return str(entry.path), entry.size, entry.mtime
+
+    def get(self, entry):
+        key = self.key(entry)
+        with self._lock:
+            text = self._texts.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._texts.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, entry, text):
+        if len(text) > self.max_chars:
+            return
+        key = self.key(entry)
+        with self._lock:
+            old = self._texts.pop(key, None)
+            if old is not None:
+                self.chars -= len(old)
+            self._texts[key] = text
+            self.chars += len(text)
+            while self.chars > self.max_chars:
+                _, evicted = self._texts.popitem(last=False)
+                self.chars -= len(evicted)
+
 
 def get_base_folder_name(client):
     parts = [client.last, client.middle, client.first]
     return "_".join(part for part in parts if part)
 
+# Name normalization shared by client tokens and document text: NFKD (which also
+# expands ligatures such as "ﬁ"), accent folding, casefolding, apostrophes and
+# soft hyphens removed, and every other run of punctuation/whitespace collapsed
+# to a single space. "José O'Brien-Smith" becomes "jose obrien smith". A
+# possessive "'s" is dropped before apostrophes are, so "Smith's" becomes "smith".
+NORMALIZE_CHUNK_SIZE = 1 << 16
+_DELETED_CHARS = "'\u2019\u02bc`\u00b4\u00ad\u200b\u200c\u200d\ufeff"
+_ASCII_FOLD = {**{ord(c): ord(c.lower()) for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"},
+               **{ord(c): None for c in _DELETED_CHARS}}
+_UNICODE_FOLD = {ord(c): None for c in _DELETED_CHARS}
+_POSSESSIVE = re.compile("['\u2019\u02bc`]s\\b", re.IGNORECASE)
+_COMBINING_MARKS = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+")
+_NON_WORD = re.compile(r"[\W_]+")
+_WHITESPACE = " \t\r\n\f\v"
+
+def normalize_text(text):
+    text = _POSSESSIVE.sub("", text)
+    if text.isascii():
+        folded = text.translate(_ASCII_FOLD)
+    else:
+        folded = _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text)).casefold().translate(_UNICODE_FOLD)
+    return _NON_WORD.sub(" ", folded)
+
+def normalize_name(name):
+    return normalize_text(name).strip()
+
+def iter_normalized_chunks(text, overlap_words=0, chunk_size=NORMALIZE_CHUNK_SIZE):
+    """Yield ``text`` normalized in chunks of about ``chunk_size`` characters.
+
+    Chunks are cut at whitespace so no word is split, and each chunk is
+    prefixed with the last ``overlap_words`` words of the previous one so
+    multi-word names spanning a cut are still seen. Only one chunk-sized copy
+    of the text exists at a time.
+    """
+    length = len(text)
+    start = 0
+    carry = ""
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            cut = max(text.rfind(ch, start, end) for ch in _WHITESPACE)
+            if cut > start:
+                end = cut + 1
+        chunk = normalize_text(text[start:end])
+        yield carry + chunk if carry else chunk
+        if overlap_words:
+            carry = " ".join(chunk.split()[-overlap_words:]) + " "
+        start = end
+
+
+FIRST_PART, MIDDLE_PART, LAST_PART = 1, 2, 4
+_PART_BITS = (("first", FIRST_PART), ("middle", MIDDLE_PART), ("last", LAST_PART))
+_FULL_NAME = FIRST_PART | LAST_PART
+# Mask recorded for a client once it has been reported, so it is yielded only once.
+_MATCHED = -1
+
+
+class ClientRegistry:
+    """Compact index of clients by stable integer ID.
+
+    IDs follow insertion order, so the same client list always yields the same
+    IDs. Each distinct normalized name token is interned once and gets a token
+    ID whose postings are packed ints ``client_id << 3 | part_bit``, which is
+    what the matcher stores and walks instead of whole Client tuples.
+
+    ``aliases`` maps a name to alternative spellings (``{"william": ["bill"]}``);
+    an alias posts to the same client and part as the name it stands for.
+    Hyphenated names are also indexed with the hyphen dropped ("smithjones").
+    """
+    __slots__ = ("clients", "ids", "tokens", "token_ids", "postings", "aliases", "max_words")
+
+    def __init__(self, clients=(), aliases=None):
+        self.clients = []
+        self.ids = {}
+        self.tokens = []
+        self.token_ids = {}
+        self.postings = []
+        self.aliases = {}
+        self.max_words = 1
+        for name, alternatives in (aliases or {}).items():
+            key = normalize_name(name)
+            if key:
+                self.aliases.setdefault(key, []).extend(
+                    alias for alias in map(normalize_name, alternatives) if alias)
+        for client in clients:
+            self.add(client)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def __getitem__(self, client_id):
+        return self.clients[client_id]
+
+    def __getstate__(self):
+        # Clients are stored as plain tuples so a pickle written by the CLI
+        # (where Client lives in __main__) still loads in the GUI and vice versa.
+        state = {name: getattr(self, name) for name in self.__slots__ if name != "ids"}
+        state["clients"] = [tuple(client) for client in self.clients]
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.clients = [Client(*client) for client in self.clients]
+        self.ids = {client: client_id for client_id, client in enumerate(self.clients)}
+
+    def add(self, client):
+        client_id = self.ids.get(client)
+        if client_id is not None:
+            return client_id
+        client_id = len(self.clients)
+        self.clients.append(client)
+        self.ids[client] = client_id
+        for part, bit in _PART_BITS:
+            token = normalize_name(getattr(client, part) or "")
+            if not token:
+                continue
+            posting = client_id << 3 | bit
+            self._add_posting(token, posting)
+            if " " in token:
+                self._add_posting(token.replace(" ", ""), posting)
+            for alias in self.aliases.get(token, ()):
+                self._add_posting(alias, posting)
+        return client_id
+
+    def _add_posting(self, token, posting):
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            token = sys.intern(token)
+            self.tokens.append(token)
+            self.token_ids[token] = token_id
+            self.postings.append((posting,))
+            self.max_words = max(self.max_words, token.count(" ") + 1)
+        elif posting not in self.postings[token_id]:
+            self.postings[token_id] += (posting,)
+
+
+# Registries built from plain client lists, so callers passing the same list
+# for every document do not rebuild the index each time.
+_REGISTRY_CACHE_SIZE = 4
+_registry_cache = OrderedDict()
+_registry_cache_lock = threading.Lock()
+
+def as_registry(clients):
+    if isinstance(clients, ClientRegistry):
+        return clients
+    key = tuple(clients)
+    with _registry_cache_lock:
+        registry = _registry_cache.get(key)
+        if registry is not None:
+            _registry_cache.move_to_end(key)
+            return registry
+    registry = ClientRegistry(key)
+    with _registry_cache_lock:
+        _registry_cache[key] = registry
+        while len(_registry_cache) > _REGISTRY_CACHE_SIZE:
+            _registry_cache.popitem(last=False)
+    return registry
+
 def build_automaton(clients):
+    ahocorasick = load_backend("ahocorasick")
     if not ahocorasick:
         return None
+    registry = as_registry(clients)
     A = ahocorasick.Automaton()
-    for client in clients:
-        A.add_word(client.first.lower(), (client, 'first'))
-        A.add_word(client.last.lower(), (client, 'last'))
-        if client.middle:
-            A.add_word(client.middle.lower(), (client, 'middle'))
+    for token_id, token in enumerate(registry.tokens):
+        A.add_word(token, token_id)
     A.make_automaton()
     return A
 
-def find_client_match(text, automaton, clients):
-    text_lower = text.lower()
+MATCHER_CACHE_DIR = CONFIG_DIR / "matchers"
+MATCHER_CACHE_KEEP = 4
+_MATCHER_FORMAT = 1
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+def matcher_key(clients, aliases=None):
+    """Hash of everything the built matcher depends on: clients, aliases, format and backend."""
+    digest = hashlib.sha256(f"v{_MATCHER_FORMAT}:{bool(load_backend('ahocorasick'))}".encode())
+    for client in clients:
+        digest.update("\x1f".join(client).encode("utf-8") + b"\x1e")
+    digest.update(json.dumps(aliases or {}, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+def load_matcher(clients, aliases=None, cache_dir=MATCHER_CACHE_DIR):
+    """Return ``(registry, automaton)`` for ``clients``, rebuilding only when the client list changed.
+
+    Builds are kept in memory for the life of the process and pickled to
+    ``cache_dir`` (pyahocorasick automatons pickle natively), so later runs and
+    later processes load the prebuilt matcher instead of rebuilding it.
+    """
+    key = matcher_key(clients, aliases)
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is not None:
+            return matcher
+        cache_file = Path(cache_dir) / f"matcher-{key}.pickle" if cache_dir else None
+        if cache_file is not None:
+            try:
+                with open(cache_file, "rb") as f:
+                    matcher = pickle.load(f)
+                os.utime(cache_file)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning("Ignoring unreadable matcher cache %s: %s", cache_file, e)
+        if matcher is None:
+            registry = ClientRegistry(clients, aliases)
+            matcher = (registry, build_automaton(registry))
+            if cache_file is not None:
+                _save_matcher(cache_file, matcher)
+        while len(_matchers) >= MATCHER_CACHE_KEEP:
+            del _matchers[next(iter(_matchers))]
+        _matchers[key] = matcher
+        return matcher
+
+def _save_matcher(cache_file, matcher):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        stale = sorted(cache_file.parent.glob("matcher-*.pickle"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old_file in stale[MATCHER_CACHE_KEEP:]:
+            old_file.unlink()
+    except OSError as e:
+        logger.warning("Could not save matcher cache: %s", e)
+
+def _iter_token_hits(chunk, automaton, registry):
+    """Yield the token ID of every whole-word name occurrence in a normalized chunk."""
     if automaton:
-        found_parts = defaultdict(set)
-        for end_index, (client, part) in automaton.iter(text_lower):
-            start_index = end_index - len(getattr(client, part)) + 1
-            if start_index > 0 and text_lower[start_index - 1].isalnum():
+        tokens = registry.tokens
+        last_index = len(chunk) - 1
+        for end_index, token_id in automaton.iter(chunk):
+            start_index = end_index - len(tokens[token_id]) + 1
+            if start_index > 0 and chunk[start_index - 1].isalnum():
                 continue
-            if end_index < len(text_lower) - 1 and text_lower[end_index + 1].isalnum():
+            if end_index < last_index and chunk[end_index + 1].isalnum():
                 continue
-            found_parts[client].add(part)
-        for client, parts in found_parts.items():
-            if 'first' in parts and 'last' in parts:
-                return client
+            yield token_id
     else:
-        for client in clients:
-            if re.search(fr'\b{client.first.lower()}\b', text_lower) and re.search(fr'\b{client.last.lower()}\b', text_lower):
-                return client
-    return None
+        # Pure-Python index: normalized text is single-space separated words, so a
+        # dict lookup per word (and per run of words for multi-word names) finds
+        # exactly the whole-word hits the automaton would.
+        token_ids = registry.token_ids
+        words = chunk.split()
+        max_words = registry.max_words
+        for i, word in enumerate(words):
+            token_id = token_ids.get(word)
+            if token_id is not None:
+                yield token_id
+            for n in range(2, min(max_words, len(words) - i) + 1):
+                token_id = token_ids.get(" ".join(words[i:i + n]))
+                if token_id is not None:
+                    yield token_id
+
+def _iter_client_ids(text, automaton, registry, masks=None):
+    """Yield each client ID once, as soon as both its first and last name have appeared in ``text``.
+
+    Passing the same ``masks`` dict for several texts matches them as one
+    document, so a first name in one region and a last name in another count.
+    """
+    postings = registry.postings
+    if masks is None:
+        masks = {}
+    for chunk in iter_normalized_chunks(text, registry.max_words - 1):
+        for token_id in _iter_token_hits(chunk, automaton, registry):
+            for posting in postings[token_id]:
+                client_id = posting >> 3
+                mask = masks.get(client_id, 0)
+                if mask == _MATCHED:
+                    continue
+                mask |= posting & 7
+                if mask & _FULL_NAME == _FULL_NAME:
+                    mask = _MATCHED
+                    yield client_id
+                masks[client_id] = mask
+
+def match_client_id(text, automaton, registry, masks=None):
+    """Return the ID of the first client whose first and last name both appear in ``text``, or None."""
+    return next(_iter_client_ids(text, automaton, registry, masks), None)
+
+def match_client_ids(text, automaton, registry, masks=None):
+    """Return the IDs of every client named in ``text``, in the order they were found."""
+    return list(_iter_client_ids(text, automaton, registry, masks))
+
+def find_client_match(text, automaton, clients):
+    """Return the first client named in ``text``, or None.
+
+    ``clients`` is a ClientRegistry or a list; a list is turned into a
+    registry (cached per distinct list), so loops should pass the registry.
+    """
+    registry = as_registry(clients)
+    client_id = match_client_id(text, automaton, registry)
+    return None if client_id is None else registry[client_id]
+
+def find_client_matches(text, automaton, clients):
+    """Return every client named in ``text``, each once; ``clients`` as for find_client_match."""
+    registry = as_registry(clients)
+    return [registry[client_id] for client_id in match_client_ids(text, automaton, registry)]
 
 def generate_folder_names(clients):
     folder_map = {}
@@ -103,19 +678,438 @@ def generate_folder_names(clients):
         folder_map[client] = base if count == 0 else f"{base}_{count+1}"
     return folder_map
 
-def collect_files(src_path: Path):
-    files = []
+def _long_path(src_path):
     src_path = Path(src_path)
     if src_path.drive and not str(src_path).startswith("\\\\?\\"):
         src_path = Path(f"\\\\?\\{src_path}")
-    for entry in src_path.rglob("*"):
+    return src_path
+
+def _scan_directory(directory, files, subdirs):
+    """List one directory with os.scandir, reusing each DirEntry's cached type and stat information.
+
+    On Windows the directory listing already carries size and mtime, so a
+    file costs no extra round trip; on POSIX it costs a single stat().
+    """
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in _DISCOVERED_EXTENSIONS and entry.is_file():
+                        st = entry.stat()
+                        files.append(FileEntry(Path(entry.path), st.st_size, st.st_mtime))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+def _walk_entries(directory, snapshot=None):
+    scan = snapshot.scan if snapshot is not None else _scan_directory
+    files = []
+    stack = [str(directory)]
+    while stack:
+        scan(stack.pop(), files, stack)
+    return files
+
+def entry_name(entry):
+    """File name used for matching and as the target name: the member's base name for archive members."""
+    if entry.member:
+        return entry.member.replace("\\", "/").rsplit("/", 1)[-1]
+    return entry.path.name
+
+def _is_archive(entry):
+    return entry.member is None and entry.path.suffix.lower() in ARCHIVE_EXTENSIONS
+
+def list_archive_members(entry):
+    """Return a FileEntry per supported document inside a ZIP archive or an .eml message's attachments.
+
+    Only the ZIP central directory is read; nested containers are not descended into.
+    """
+    members = []
+    try:
+        if entry.path.suffix.lower() == ".zip":
+            with zipfile.ZipFile(entry.path) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir() and has_valid_extension(Path(info.filename)):
+                        members.append(FileEntry(entry.path, info.file_size, entry.mtime, info.filename))
+        else:
+            for index, part in _iter_eml_attachments(entry.path):
+                filename = part.get_filename() or ""
+                if has_valid_extension(Path(filename)):
+                    members.append(FileEntry(entry.path, _attachment_size(part), entry.mtime, f"{index}/{filename}"))
+    except (OSError, zipfile.BadZipFile, ValueError, LookupError):
+        pass
+    return members
+
+def _iter_eml_attachments(path):
+    with open(path, "rb") as f:
+        message = email.message_from_binary_file(f, policy=email.policy.default)
+    return enumerate(message.iter_attachments())
+
+def _attachment_size(part):
+    """Decoded size of an attachment, worked out from its encoded payload without decoding it."""
+    payload = part.get_payload()
+    if not isinstance(payload, str):
+        return 0
+    if part.get('Content-Transfer-Encoding', '').strip().lower() != 'base64':
+        return len(payload)
+    encoded = "".join(payload.split())
+    return len(encoded) * 3 // 4 - encoded[-2:].count("=")
+
+def _eml_document_payloads(path):
+    return {index: part.get_payload(decode=True) or b""
+            for index, part in _iter_eml_attachments(path) if has_valid_extension(Path(part.get_filename() or ""))}
+
+
+DEFAULT_EML_CACHE_MB = 64
+
+class EmlAttachmentCache:
+    """Decoded attachments of the .eml messages a run has parsed, so each message is parsed once.
+
+    Cost-first scheduling scatters one message's attachments through the run,
+    so the first read decodes all of them; each is handed out once, and beyond
+    ``max_mb`` the oldest messages are dropped and parsed again on demand.
+    """
+
+    def __init__(self, max_mb=DEFAULT_EML_CACHE_MB):
+        self.max_bytes = max_mb * 1024 * 1024
+        self.bytes = 0
+        self.parses = 0
+        self._messages = OrderedDict()
+        # Messages being parsed, each with an event set once its attachments are cached,
+        # and the attachments already handed out, which a later parse must not cache again.
+        self._parsing = {}
+        self._handed_out = {}
+        self._lock = threading.Lock()
+
+    def _take(self, key, index):
+        parts = self._messages.get(key)
+        if parts is None or index not in parts:
+            return None
+        payload = parts.pop(index)
+        self._handed_out[key].add(index)
+        self.bytes -= len(payload)
+        if not parts:
+            del self._messages[key]
+        return payload
+
+    def read(self, entry, index):
+        key = (str(entry.path), entry.mtime)
+        while True:
+            with self._lock:
+                payload = self._take(key, index)
+                if payload is not None:
+                    return payload
+                parsing = self._parsing.get(key)
+                if parsing is None:
+                    parsing = self._parsing[key] = threading.Event()
+                    break
+            # Another thread is parsing this message; take the attachment from its result.
+            parsing.wait()
         try:
-            if entry.is_file() and has_valid_extension(entry):
-                files.append(entry)
-        except (PermissionError, OSError):
-            continue
+            parts = _eml_document_payloads(entry.path)
+            payload = parts.pop(index)
+            with self._lock:
+                self.parses += 1
+                handed_out = self._handed_out.setdefault(key, set())
+                handed_out.add(index)
+                old = self._messages.pop(key, None)
+                if old:
+                    self.bytes -= sum(len(part) for part in old.values())
+                parts = {i: part for i, part in parts.items() if i not in handed_out}
+                if parts:
+                    self._messages[key] = parts
+                    self.bytes += sum(len(part) for part in parts.values())
+                while self.bytes > self.max_bytes and self._messages:
+                    _, evicted = self._messages.popitem(last=False)
+                    self.bytes -= sum(len(part) for part in evicted.values())
+        finally:
+            with self._lock:
+                del self._parsing[key]
+            parsing.set()
+        return payload
+
+
+def read_entry_bytes(entry, eml_cache=None):
+    """Read a file, or a single archive member straight into memory without unpacking the container."""
+    if not entry.member:
+        return entry.path.read_bytes()
+    try:
+        if entry.path.suffix.lower() == ".zip":
+            with zipfile.ZipFile(entry.path) as zf:
+                return zf.read(entry.member)
+        wanted = int(entry.member.split("/", 1)[0])
+        if eml_cache is not None:
+            return eml_cache.read(entry, wanted)
+        for index, part in _iter_eml_attachments(entry.path):
+            if index == wanted:
+                return part.get_payload(decode=True) or b""
+    except (zipfile.BadZipFile, KeyError, ValueError, LookupError) as e:
+        raise OSError(f"cannot read {entry.member} from {entry.path.name}: {e}")
+    raise OSError(f"{entry.member} not found in {entry.path.name}")
+
+def _split_archives(entries, archives, executor=None):
+    files = [entry for entry in entries if not _is_archive(entry)]
+    if archives:
+        containers = [entry for entry in entries if _is_archive(entry)]
+        for members in (executor.map if executor else map)(list_archive_members, containers):
+            files.extend(members)
     return files
 
+def collect_file_entries(src_path: Path, archives=True, snapshot=None):
+    """Walk ``src_path`` and return a FileEntry (path, size, mtime) for every supported file.
+
+    With ``archives``, supported documents inside ZIP files and .eml attachments
+    are returned as virtual entries whose ``member`` names them. A ScanSnapshot
+    makes the walk reuse the listings of directories that have not changed.
+    """
+    return _split_archives(_walk_entries(_long_path(src_path), snapshot), archives)
+
+def collect_files(src_path: Path, snapshot=None):
+    return [entry.path for entry in collect_file_entries(src_path, archives=False, snapshot=snapshot)]
+
+def discover_files(src_path, executor=None, archives=True, snapshot=None):
+    """Like collect_file_entries, but walks top-level subdirectories concurrently on ``executor``."""
+    if executor is None:
+        return collect_file_entries(src_path, archives, snapshot)
+    scan = snapshot.scan if snapshot is not None else _scan_directory
+    files = []
+    subdirs = []
+    scan(str(_long_path(src_path)), files, subdirs)
+    for sub_files in executor.map(lambda directory: _walk_entries(directory, snapshot), subdirs):
+        files.extend(sub_files)
+    return _split_archives(files, archives, executor)
+
+
+SCAN_SNAPSHOT_DIR = CONFIG_DIR / "scans"
+# Directories modified this close to the previous scan are listed again, since
+# a coarse mtime (FAT, some SMB servers) could hide a change made in the same tick.
+SCAN_MTIME_GRANULARITY_NS = 2_000_000_000
+
+
+class ScanSnapshot:
+    """Directory listings from the previous walk of a source tree, keyed by directory mtime.
+
+    Adding, removing or renaming an entry updates its directory's mtime, so a
+    directory whose mtime is unchanged reuses its cached files and
+    subdirectories without being listed. A parent's mtime does not change when
+    something deeper in the tree does, so every subdirectory is still stat'ed.
+    Edits that rewrite a file in place are not seen in an unchanged directory
+    until the next full rescan.
+    """
+
+    def __init__(self, src_path, snapshot_dir=SCAN_SNAPSHOT_DIR, full_rescan=False):
+        key = hashlib.sha256(_tuning_key(src_path).encode("utf-8")).hexdigest()[:32]
+        self.path = Path(snapshot_dir) / f"scan-{key}.pickle"
+        self.previous = {}
+        self.previous_time_ns = 0
+        if not full_rescan:
+            try:
+                with open(self.path, "rb") as f:
+                    self.previous_time_ns, self.previous = pickle.load(f)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning("Ignoring unreadable scan snapshot %s: %s", self.path, e)
+        self.started_ns = time.time_ns()
+        self.directories = {}
+        self.listed = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def scan(self, directory, files, subdirs):
+        """Drop-in for _scan_directory that reuses the cached listing of an unchanged directory."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+        cached = self.previous.get(directory)
+        if cached is not None and cached[0] == mtime_ns and mtime_ns < self.previous_time_ns - SCAN_MTIME_GRANULARITY_NS:
+            _, dir_files, dir_subdirs = cached
+            reused = True
+        else:
+            found, dir_subdirs = [], []
+            _scan_directory(directory, found, dir_subdirs)
+            dir_files = [(str(entry.path), entry.size, entry.mtime) for entry in found]
+            reused = False
+        files.extend(FileEntry(Path(path), size, mtime) for path, size, mtime in dir_files)
+        subdirs.extend(dir_subdirs)
+        with self._lock:
+            self.directories[directory] = (mtime_ns, dir_files, dir_subdirs)
+            if reused:
+                self.reused += 1
+            else:
+                self.listed += 1
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump((self.started_ns, self.directories), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.path)
+        except OSError as e:
+            logger.warning("Could not save scan snapshot: %s", e)
+
+# Relative cost of extracting text per byte; files without an extractor are filename-only and nearly free.
+EXTRACTION_COST_WEIGHTS = {".pdf": 4.0, ".docx": 2.0, ".txt": 1.0}
+
+def estimate_cost(entry):
+    return entry.size * EXTRACTION_COST_WEIGHTS.get(os.path.splitext(entry_name(entry))[1].lower(), 0.0)
+
+def schedule_entries(entries):
+    """Order entries longest-processing-time first so one huge document cannot trail the batch."""
+    return sorted(entries, key=estimate_cost, reverse=True)
+
+def _unique_name(taken, filename):
+    """Return ``filename`` or the first free ``stem_N.ext`` variant, given a set of normcased names."""
+    if os.path.normcase(filename) not in taken:
+        return filename
+    stem, suffix = os.path.splitext(filename)
+    counter = 1
+    while True:
+        candidate = f"{stem}_{counter}{suffix}"
+        if os.path.normcase(candidate) not in taken:
+            return candidate
+        counter += 1
+
+
+class DestinationIndex:
+    """Cache of the names in each destination folder.
+
+    Each folder is listed at most once per run, and the cached names are the
+    first guess for a free target instead of probing with exists(). A name is
+    only handed out once it has been claimed on disk with O_CREAT|O_EXCL, so
+    other processes writing to the same destination (shard workers, the
+    service, another GUI) can never be given the same target; a name taken
+    behind our back just moves on to the next ``_N`` suffix.
+    """
+
+    def __init__(self, dest_path):
+        self.dest_path = Path(dest_path)
+        self._names = {}
+        self._lock = threading.Lock()
+        self._folder_locks = {}
+
+    def _folder_lock(self, folder):
+        with self._lock:
+            lock = self._folder_locks.get(folder)
+            if lock is None:
+                lock = self._folder_locks[folder] = threading.Lock()
+            return lock
+
+    def prepare(self, folders, executor=None, create=True):
+        """Create the given folders up front with one listing of the destination root.
+
+        Folders this call created are known to have started empty, so they are
+        not listed later; one another process created first is listed as usual.
+        """
+        try:
+            existing = {os.path.normcase(name) for name in os.listdir(self.dest_path)}
+        except OSError:
+            existing = set()
+        missing = [folder for folder in set(folders) if os.path.normcase(folder) not in existing]
+        if not create:
+            return 0
+
+        def make(folder):
+            try:
+                (self.dest_path / folder).mkdir(parents=True)
+                return folder
+            except OSError:
+                return None
+
+        created = list((executor.map if executor else map)(make, missing))
+        with self._lock:
+            for folder in created:
+                if folder is not None:
+                    self._names.setdefault(folder, set())
+        return sum(1 for folder in created if folder is not None)
+
+    def reserve(self, folder, filename, create=True):
+        """Return a free target path in ``folder`` and mark its name as taken.
+
+        With ``create`` the target is claimed by creating it as an empty file,
+        which the caller then overwrites; without it (dry runs) nothing is
+        written and the name is only reserved in memory.
+        """
+        target_dir = self.dest_path / folder
+        with self._folder_lock(folder):
+            names = self._names.get(folder)
+            if names is None:
+                try:
+                    names = {os.path.normcase(name) for name in os.listdir(target_dir)}
+                except FileNotFoundError:
+                    names = set()
+                    if create:
+                        target_dir.mkdir(parents=True, exist_ok=True)
+                self._names[folder] = names
+            while True:
+                name = _unique_name(names, filename)
+                names.add(os.path.normcase(name))
+                if not create:
+                    break
+                try:
+                    os.close(os.open(target_dir / name, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    break
+                except FileExistsError:
+                    continue
+        return target_dir / name
+
+
+def _is_same_file(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+def link_or_copy(source, targets, chunk_size=1024 * 1024):
+    """Hard-link ``source`` to each of ``targets``, falling back to copying.
+
+    Linking stops at the first failure (another filesystem, or one without
+    hard links), and the rest are written in a single pass over ``source``
+    that fans each chunk out to every target. Returns how many were linked.
+    """
+    linked = 0
+    for target in targets:
+        # Targets may be placeholders claimed by DestinationIndex, which os.link
+        # cannot overwrite; link beside them and rename over them instead.
+        tmp = target.with_name(f".{target.name}.{os.getpid()}-{threading.get_ident()}.link")
+        try:
+            os.link(source, tmp)
+        except OSError:
+            break
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            os.unlink(tmp)
+            break
+        linked += 1
+    remaining = targets[linked:]
+    if remaining:
+        outputs = []
+        try:
+            for target in remaining:
+                outputs.append(open(target, 'wb'))
+            with open(source, 'rb') as f:
+                while chunk := f.read(chunk_size):
+                    for out in outputs:
+                        out.write(chunk)
+        finally:
+            for out in outputs:
+                out.close()
+        for target in remaining:
+            shutil.copystat(source, target)
+    return linked
+
+def _move_over(source, target):
+    """Move ``source`` onto ``target`` (a claimed placeholder), renaming when both are on one volume."""
+    try:
+        os.replace(source, target)
+    except OSError:
+        shutil.move(source, target)
+
 def get_unique_filepath(target_dir, filename):
     target_path = target_dir / filename
     if not target_path.exists():
@@ -130,83 +1124,1413 @@ def get_unique_filepath(target_dir, filename):
 
 
 
-def run_organization_task(config):
-    src_path = Path(config['src_path'])
-    dest_path = Path(config['dest_path'])
-    clients = config['clients_list']
-    do_move = config['do_move']
-    dry_run = config.get('dry_run', False)
-    stop_event = config.get('stop_event', threading.Event())
+PlanRow = namedtuple("PlanRow", ["source", "folder", "match_type", "size", "mtime", "member"], defaults=("",))
+DEFAULT_PLAN_FILE = CONFIG_DIR / "last-plan.tsv"
+# Joins the folders of a multi-client row; '|' cannot appear in a Windows file name.
+PLAN_FOLDER_SEPARATOR = "|"
 
-    log = config.get('log_callback', lambda msg, cat='info': print(f"[{cat}] {msg}"))
-    progress = config.get('progress_callback', lambda done, total: None)
+def _plan_key(row):
+    return row.source, row.member
 
-    folder_map = generate_folder_names(clients)
-    automaton = build_automaton(clients)
+def write_plan(plan_path, rows, presorted=False):
+    """Write a move plan as TSV sorted by source path, so two plans can be diffed in one streaming pass."""
+    plan_path = Path(plan_path)
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(plan_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+        writer.writerow(PlanRow._fields)
+        for row in rows if presorted else sorted(rows, key=_plan_key):
+            writer.writerow((row.source, row.folder, row.match_type, row.size, repr(row.mtime), row.member))
 
-    files = collect_files(src_path)
-    if not files:
-        log("No valid files found.", 'info')
-        return
+def read_plan(plan_path):
+    with open(plan_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, delimiter='\t')
+        next(reader, None)
+        for source, folder, match_type, size, mtime, *member in reader:
+            yield PlanRow(source, folder, match_type, int(size), float(mtime), member[0] if member else "")
 
-    log(f"Found {len(files)} files to process.", 'info')
+def diff_plans(old_plan, new_plan):
+    """Yield (change, old_row, new_row) for sources added, removed or changed between two plans.
 
-    stats = Counter()
+    Both files are sorted by source, so this is a single merge walk that never
+    loads either plan into memory.
+    """
+    old_rows, new_rows = read_plan(old_plan), read_plan(new_plan)
+    old, new = next(old_rows, None), next(new_rows, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and _plan_key(old) < _plan_key(new)):
+            yield ('removed', old, None)
+            old = next(old_rows, None)
+        elif old is None or _plan_key(new) < _plan_key(old):
+            yield ('added', None, new)
+            new = next(new_rows, None)
+        else:
+            if old != new:
+                yield ('changed', old, new)
+            old, new = next(old_rows, None), next(new_rows, None)
+
+def merge_plans(plan_paths, merged_path):
+    """Merge sorted plans (e.g. one per shard) into one sorted plan without loading them into memory."""
+    write_plan(merged_path, heapq.merge(*(read_plan(path) for path in plan_paths), key=_plan_key), presorted=True)
+
+
+# Per-file run report: one record per file, streamed to CSV or (for a .jsonl
+# path) JSON Lines by a background thread, so a 500k-file run leaves an
+# auditable record without slowing the pipeline.
+REPORT_FIELDS = ("source", "member", "target", "status", "match_type", "region", "clients", "size",
+                 "read_ms", "match_ms", "transfer_ms", "error")
+REPORT_DIR = CONFIG_DIR / "reports"
+REPORT_BATCH_SIZE = 1000
+REPORT_FLUSH_INTERVAL = 1.0
+
+def _is_jsonl(path):
+    return Path(path).suffix.lower() in (".jsonl", ".json")
+
+
+class RunReport:
+    """Writes report records in batches from its own thread; ``add`` only enqueues."""
+
+    def __init__(self, report_path):
+        self.path = Path(report_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.records = 0
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="organizer-report", daemon=True)
+        self._thread.start()
 
-    def worker_func(file_path):
-        if stop_event.is_set():
-            return ('CANCELLED', file_path, None)
-        match_type = None
-        matched_client = None
+    def add(self, record):
+        self._queue.put(record)
 
-        filename_client = find_client_match(file_path.name, automaton, clients)
-        if filename_client:
-            matched_client = filename_client
-            match_type = "FILENAME"
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _write_loop(self):
+        jsonl = _is_jsonl(self.path)
+        with self._file as f:
+            writer = None if jsonl else csv.writer(f, lineterminator='\n')
+            if writer:
+                writer.writerow(REPORT_FIELDS)
+            done = False
+            while not done:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + REPORT_FLUSH_INTERVAL
+                while batch[-1] is not None and len(batch) < REPORT_BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+                if batch[-1] is None:
+                    batch.pop()
+                    done = True
+                if jsonl:
+                    f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+                else:
+                    # One record per physical line keeps the report indexable by line offset.
+                    writer.writerows([str(record[field]).replace("\r", " ").replace("\n", " ")
+                                      for field in REPORT_FIELDS] for record in batch)
+                f.flush()
+                self.records += len(batch)
+
+
+class ReportIndex:
+    """Random access to the records of a run report by position.
+
+    Opening scans the file once for line offsets, so any page of a very
+    large report is read with one seek.
+    """
+
+    def __init__(self, report_path):
+        self.path = Path(report_path)
+        self.jsonl = _is_jsonl(self.path)
+        offsets = []
+        position = 0
+        with open(self.path, 'rb') as f:
+            if not self.jsonl:
+                position += len(f.readline())
+            for line in f:
+                if line.strip():
+                    offsets.append(position)
+                position += len(line)
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def page(self, start, count):
+        """Return up to ``count`` records (dicts of REPORT_FIELDS) starting at record ``start``."""
+        if start >= len(self.offsets):
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[start])
+            lines = [f.readline().decode('utf-8') for _ in range(min(count, len(self.offsets) - start))]
+        if self.jsonl:
+            return [json.loads(line) for line in lines]
+        return [dict(zip(REPORT_FIELDS, row)) for row in csv.reader(lines)]
+
+
+DEFAULT_DISCOVERY_WORKERS = 4
+DEFAULT_READ_WORKERS = 8
+DEFAULT_MATCH_WORKERS = os.cpu_count() or 4
+DEFAULT_TRANSFER_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 64
+
+_STAGES = ('read', 'match', 'transfer')
+_NEXT_STAGE = {'read': 'match', 'match': 'transfer'}
+
+DEFAULT_AUTOSCALE_BOUNDS = {
+    'read': (1, 32),
+    'match': (1, (os.cpu_count() or 4) * 2),
+    'transfer': (1, 32),
+}
+DEFAULT_AUTOSCALE_INTERVAL = 2.0
+HILL_CLIMB_TOLERANCE = 0.05
+
+TUNING_FILE = CONFIG_DIR / "tuning.json"
+
+
+def _tuning_key(src_path):
+    return os.path.normcase(os.path.abspath(str(src_path)))
+
+def _read_json_file(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_json_file(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def load_tuned_limits(src_path, tuning_file=TUNING_FILE):
+    """Return the best-known stage limits saved for ``src_path``, or an empty dict."""
+    return _read_json_file(tuning_file).get(_tuning_key(src_path), {})
+
+def save_tuned_limits(src_path, limits, tuning_file=TUNING_FILE):
+    data = _read_json_file(tuning_file)
+    data[_tuning_key(src_path)] = dict(limits)
+    _write_json_file(tuning_file, data)
+
+
+class _AdaptiveLimit:
+    """An asyncio semaphore whose limit can be changed while it is in use."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    async def set_limit(self, limit):
+        async with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        await self.release()
+
+
+class _HillClimber:
+    """Moves a concurrency limit one step at a time towards higher files/s."""
+
+    def __init__(self, limit, low, high):
+        self.low, self.high = low, high
+        self.limit = min(max(limit, low), high)
+        self.direction = 1
+        self.last_rate = None
+        self.best_rate = 0.0
+        self.best_limit = self.limit
+
+    def update(self, rate):
+        if rate > self.best_rate:
+            self.best_rate, self.best_limit = rate, self.limit
+        if self.last_rate is not None and rate < self.last_rate * (1 - HILL_CLIMB_TOLERANCE):
+            self.direction = -self.direction
+        self.last_rate = rate
+        step = max(1, self.limit // 4)
+        new_limit = min(max(self.limit + self.direction * step, self.low), self.high)
+        if new_limit == self.limit:
+            self.direction = -self.direction
+        self.limit = new_limit
+        return new_limit
+
+
+# Bytes a worker holds per byte of input while a document is read, parsed and
+# matched: the raw bytes, the parser's objects and the extracted text.
+MEMORY_ESTIMATE_FACTORS = {".pdf": 6.0, ".docx": 8.0, ".txt": 3.0}
+# Reading an .eml attachment parses the whole message: its raw bytes plus the decoded parts.
+EML_MEMORY_FACTOR = 2.0
+DEFAULT_MEMORY_FRACTION = 0.25
+DEFAULT_MEMORY_BUDGET_MB = 1024
+
+def estimate_memory(entry):
+    factor = MEMORY_ESTIMATE_FACTORS.get(os.path.splitext(entry_name(entry))[1].lower())
+    if not factor:
+        return 0
+    estimate = int(entry.size * factor) + NORMALIZE_CHUNK_SIZE * 4
+    if entry.member and entry.path.suffix.lower() == ".eml":
+        try:
+            estimate += int(os.stat(entry.path).st_size * EML_MEMORY_FACTOR)
+        except OSError:
+            pass
+    return estimate
+
+def total_memory_bytes():
+    """Physical memory of this machine, or None if it cannot be determined."""
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys
+        return None
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None if unavailable."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    return None
+
+
+class MemoryBudget:
+    """Byte budget that documents reserve from before they are read.
+
+    A reservation waits while the budget is used up, so the number of
+    documents in memory at once follows their sizes rather than the worker
+    count. A single document larger than the whole budget is let through once
+    nothing else is reserved. Used from the event loop only.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.peak = 0
+        self._cond = asyncio.Condition()
+
+    async def reserve(self, amount):
+        amount = min(amount, self.limit)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.used == 0 or self.used + amount <= self.limit)
+            self.used += amount
+            self.peak = max(self.peak, self.used)
+        return amount
+
+    async def release(self, amount):
+        async with self._cond:
+            self.used -= amount
+            self._cond.notify_all()
+
+
+PROFILE_DIR = CONFIG_DIR / "profiles"
+DEFAULT_PROFILE_INTERVAL = 0.01
+PROFILE_TOP_STACKS = 200
+# Threads the profiler samples: the stage executors and asyncio.to_thread helpers.
+_PROFILED_THREAD_PREFIXES = ("organizer-", "asyncio_")
+# Leaf frames of a thread that is parked waiting for work rather than doing any.
+# A thread waiting on a sandbox worker is idle too: the worker's own samples are merged in instead.
+_IDLE_FRAMES = {("thread.py", "_worker"), ("threading.py", "wait"), ("queue.py", "get"),
+                ("selectors.py", "select"), ("connection.py", "_exhaustive_wait")}
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the pipeline's worker threads with sys._current_frames().
+
+    Every ``interval`` seconds the stack of each busy worker thread is
+    recorded, giving self and total sample counts per function plus the most
+    common call stacks. Only threads whose names start with ``thread_prefixes``
+    are sampled, and with ``active`` only while that Event is set. Sandbox
+    workers run one of these themselves; see drain() and merge().
+    """
+
+    def __init__(self, interval=DEFAULT_PROFILE_INTERVAL, thread_prefixes=_PROFILED_THREAD_PREFIXES, active=None):
+        self.interval = interval
+        self.thread_prefixes = thread_prefixes
+        self.active = active
+        self.samples = 0
+        self.idle = 0
+        self.self_counts = Counter()
+        self.total_counts = Counter()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._started = None
+        self._elapsed = 0.0
+
+    def start(self):
+        self._started = time.time()
+        self._thread = threading.Thread(target=self._sample_loop, name="organizer-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._elapsed = time.time() - self._started
+
+    def _sample_loop(self):
+        me = threading.get_ident()
+        labels = {}
+        while not self._stop.wait(self.interval):
+            if self.active is not None and not self.active.is_set():
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me or not names.get(ident, "").startswith(self.thread_prefixes):
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                    with self._lock:
+                        self.samples += 1
+                        self.idle += 1
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                with self._lock:
+                    self.samples += 1
+                    self.self_counts[stack[0]] += 1
+                    self.total_counts.update(set(stack))
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def drain(self):
+        """Return the samples taken since the last drain, as a picklable tuple for merge(), and reset them."""
+        with self._lock:
+            samples = (self.samples, self.idle, dict(self.self_counts), dict(self.total_counts), dict(self.stacks))
+            self.samples = self.idle = 0
+            self.self_counts, self.total_counts, self.stacks = Counter(), Counter(), Counter()
+        return samples
+
+    def merge(self, samples):
+        """Add samples drained from another profiler, such as a sandbox worker's."""
+        count, idle, self_counts, total_counts, stacks = samples
+        with self._lock:
+            self.samples += count
+            self.idle += idle
+            self.self_counts.update(self_counts)
+            self.total_counts.update(total_counts)
+            self.stacks.update(stacks)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'started': self._started,
+                'duration': self._elapsed,
+                'interval': self.interval,
+                'samples': self.samples,
+                'idle_samples': self.idle,
+                'functions': [{'function': name, 'self': self.self_counts[name], 'total': total}
+                              for name, total in self.total_counts.most_common()],
+                'stacks': dict(self.stacks.most_common(PROFILE_TOP_STACKS)),
+            }
+
+    def write(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+
+_STARTUP_FRAMES = ("(threading.py:", "<module> (<string>:", "(thread.py:", "(process.py:", "(spawn.py:", "(popen_", "_sandbox_main (")
+
+def summarize_profile(profile_path, top=20):
+    """Return the text report of a profile artifact: the ``top`` functions by self and by total time."""
+    with open(profile_path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    interval = profile['interval']
+    busy = max(1, profile['samples'] - profile['idle_samples'])
+    lines = [f"{profile['samples']} samples over {profile['duration']:.1f}s "
+             f"({profile['idle_samples']} idle), {interval * 1000:.0f} ms interval"]
+    # Thread and sandbox process start-up frames are under every sample and would crowd out the real hot spots.
+    functions = [row for row in profile['functions'] if not any(
+        frame in row['function'] for frame in _STARTUP_FRAMES)]
+    for key in ('self', 'total'):
+        lines.append(f"Top {top} by {key} time:")
+        for row in sorted(functions, key=lambda row: row[key], reverse=True)[:top]:
+            lines.append(f"  {row[key] * interval:8.2f}s {100 * row[key] / busy:5.1f}%  {row['function']}")
+    return "\n".join(lines)
+
+
+class _Job:
+    """A single file travelling through the pipeline stages."""
+    __slots__ = ("entry", "path", "size", "mtime", "member", "name", "ext", "source", "cost",
+                 "client_id", "extra_client_ids", "folder", "match_type", "region", "data", "text", "reserved",
+                 "timings", "error", "result")
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.path, self.size, self.mtime, self.member = entry
+        self.name = entry_name(entry)
+        self.ext = os.path.splitext(self.name)[1].lower()
+        # What results report as the file: archive members read as <archive>/<member>.
+        self.source = self.path / self.member if self.member else self.path
+        self.cost = estimate_cost(entry)
+        self.client_id = None
+        # Further clients a multi-client document is filed under besides ``client_id``.
+        self.extra_client_ids = ()
+        self.folder = None
+        self.match_type = None
+        self.region = None
+        self.data = None
+        self.text = None
+        self.reserved = 0
+        self.timings = {}
+        self.error = None
+        self.result = None
+
+
+class _OrganizationRun:
+    """Per-run state shared by the pipeline stages."""
+
+    def __init__(self, config):
+        self.apply_plan = config.get('apply_plan')
+        self.src_path = Path(config.get('src_path') or self.apply_plan)
+        self.dest_path = Path(config['dest_path'])
+        if self.apply_plan:
+            # Applying a plan never matches anything, so skip loading the matcher.
+            self.registry, self.automaton = ClientRegistry(), None
+        elif config.get('matcher'):
+            # A long-lived caller (the service) passes the (registry, automaton) it keeps warm.
+            self.registry, self.automaton = config['matcher']
+        else:
+            self.registry, self.automaton = load_matcher(
+                config.get('clients_list', []), config.get('aliases'),
+                config.get('matcher_cache_dir', MATCHER_CACHE_DIR))
+        self.do_move = config['do_move']
+        self.dry_run = config.get('dry_run', False)
+        self.plan_path = config.get('plan_path', DEFAULT_PLAN_FILE)
+        self.plan_rows = [] if self.dry_run and self.plan_path else None
+        self.stop_event = config.get('stop_event', threading.Event())
+        self.log = config.get('log_callback', lambda msg, cat='info': print(f"[{cat}] {msg}"))
+        self.progress = config.get('progress_callback', lambda done, total: None)
+        self.limits = {
+            'discovery': max(1, config.get('discovery_workers', DEFAULT_DISCOVERY_WORKERS)),
+            'read': max(1, config.get('read_workers', DEFAULT_READ_WORKERS)),
+            'match': max(1, config.get('match_workers', DEFAULT_MATCH_WORKERS)),
+            'transfer': max(1, config.get('transfer_workers', DEFAULT_TRANSFER_WORKERS)),
+        }
+        self.queue_size = max(1, config.get('queue_size', DEFAULT_QUEUE_SIZE))
+        self.file_timeout = config.get('file_timeout')
+        self.file_entries = config.get('file_entries')
+        self.archives = config.get('archives', True)
+        self.multi_client = config.get('multi_client', False)
+        region_limits = config.get('match_regions')
+        if region_limits:
+            region_limits = dict(DEFAULT_REGION_LIMITS, **(region_limits if isinstance(region_limits, dict) else {}))
+        self.region_limits = region_limits or None
+        self.region_hits = Counter()
+        self.incremental_scan = config.get('incremental_scan', False)
+        self.full_rescan = config.get('full_rescan', False)
+        self.scan_snapshot_dir = config.get('scan_snapshot_dir', SCAN_SNAPSHOT_DIR)
+        # Archive members are not cached: the transfer stage needs their bytes anyway.
+        self.extraction_cache = config.get('extraction_cache')
+        self.eml_cache = EmlAttachmentCache()
+        budget_mb = config.get('memory_budget_mb')
+        if budget_mb:
+            budget = budget_mb * 1024 * 1024
+        else:
+            physical = total_memory_bytes()
+            budget = int(physical * DEFAULT_MEMORY_FRACTION) if physical else DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
+        self.memory = MemoryBudget(budget)
+        self.autoscale = config.get('autoscale', True)
+        self.autoscale_interval = config.get('autoscale_interval', DEFAULT_AUTOSCALE_INTERVAL)
+        self.tuning_file = config.get('tuning_file', TUNING_FILE)
+        self.climbers = {}
+        if self.autoscale:
+            bounds = dict(DEFAULT_AUTOSCALE_BOUNDS, **config.get('autoscale_bounds', {}))
+            tuned = load_tuned_limits(self.src_path, self.tuning_file)
+            for name in _STAGES:
+                low, high = bounds[name]
+                self.climbers[name] = _HillClimber(tuned.get(name, self.limits[name]), low, high)
+                self.limits[name] = self.climbers[name].limit
+        self.completed = Counter()
+        # Timed-out jobs whose threads are still running (with the stage they timed out in), and the
+        # pending releases of their memory.
+        self.abandoned = {}
+        self.releases = set()
+        self.sandbox = None
+        if config.get('sandbox_extraction', True):
+            self.sandbox = ExtractionSandbox(
+                _stage_workers(self, 'match'),
+                timeout=config.get('extract_timeout', DEFAULT_EXTRACT_TIMEOUT),
+                memory_limit_mb=config.get('extract_memory_mb', DEFAULT_EXTRACT_MEMORY_MB),
+                recycle_after=config.get('extract_recycle_after', DEFAULT_EXTRACT_RECYCLE_AFTER),
+            )
+        folder_map = generate_folder_names(self.registry.clients)
+        self.folder_names = [folder_map[client] for client in self.registry.clients]
+        self.destination = DestinationIndex(self.dest_path)
+        self.precreate_folders = config.get('precreate_folders', True)
+        report_path = config.get('report_path')
+        self.report = RunReport(report_path) if report_path else None
+
+    def report_record(self, job):
+        status, _, target = job.result
+        if job.folder is not None:
+            clients = job.folder
+        elif job.client_id is not None:
+            clients = PLAN_FOLDER_SEPARATOR.join(
+                self.folder_names[client_id] for client_id in (job.client_id, *job.extra_client_ids))
+        else:
+            clients = ""
+        timings = job.timings
+        return {
+            'source': str(job.path),
+            'member': job.member or "",
+            'target': str(target) if target else "",
+            'status': status,
+            'match_type': job.match_type or "",
+            'region': job.region or "",
+            'clients': clients,
+            'size': job.size,
+            'read_ms': round(timings.get('read', 0.0) * 1000, 1),
+            'match_ms': round(timings.get('match', 0.0) * 1000, 1),
+            'transfer_ms': round(timings.get('transfer', 0.0) * 1000, 1),
+            'error': job.error or "",
+        }
+
+    def discover(self, executor):
+        if self.apply_plan:
+            return list(read_plan(self.apply_plan))
+        if self.file_entries is not None:
+            return list(self.file_entries)
+        snapshot = None
+        if self.incremental_scan:
+            snapshot = ScanSnapshot(self.src_path, self.scan_snapshot_dir, self.full_rescan)
+        files = discover_files(self.src_path, executor, self.archives, snapshot)
+        if snapshot is not None:
+            snapshot.save()
+            self.log(f"Listed {snapshot.listed} directories, reused {snapshot.reused} unchanged.", 'info')
+        return files
+
+    def prepare_destination(self, files, executor):
+        if self.dry_run or not self.precreate_folders:
+            return
+        if self.apply_plan:
+            folders = {folder for entry in files for folder in entry.folder.split(PLAN_FOLDER_SEPARATOR)}
+        else:
+            folders = self.folder_names
+        created = self.destination.prepare(folders, executor)
+        if created:
+            self.log(f"Created {created} client folders.", 'info')
+
+    def make_job(self, entry):
+        if isinstance(entry, PlanRow):
+            job = _Job(FileEntry(Path(entry.source), entry.size, entry.mtime, entry.member or None))
+            job.folder, job.match_type = entry.folder, entry.match_type
+            return job
+        return _Job(entry)
+
+    def match(self, job, text, masks=None):
+        """Set the job's client(s) from ``text``; returns False if nobody matched."""
+        if self.multi_client:
+            client_ids = match_client_ids(text, self.automaton, self.registry, masks)
+            if not client_ids:
+                return False
+            job.client_id, *extra = client_ids
+            job.extra_client_ids = tuple(extra)
         else:
-            text = extract_text(file_path)
-            if text:
-                content_client = find_client_match(text, automaton, clients)
-                if content_client:
-                    matched_client = content_client
-                    match_type = "CONTENT"
-
-        if matched_client:
-            folder_name = folder_map[matched_client]
-            target_dir = dest_path / folder_name
-            target_dir.mkdir(parents=True, exist_ok=True)
-            target_path = get_unique_filepath(target_dir, file_path.name)
-
-            if not dry_run:
+            job.client_id = match_client_id(text, self.automaton, self.registry, masks)
+        return job.client_id is not None
+
+    def match_regions(self, job, data):
+        """Match the document's head regions, then its body only if the head named nobody.
+
+        Name parts seen in earlier regions carry over to later ones. With
+        multi_client, the clients are those named by the first region that
+        names any.
+        """
+        masks = {}
+        for part in ('head', 'body'):
+            for region, text in self.extract(data, job.ext, part):
+                if text and self.match(job, text, masks):
+                    job.region = region
+                    self.region_hits[region] += 1
+                    return True
+        self.region_hits['none'] += 1
+        return False
+
+    def read_stage(self, job):
+        if self.stop_event.is_set():
+            job.result = ('CANCELLED', job.source, None)
+            return job
+        if self.match(job, job.name):
+            job.match_type = "FILENAME"
+            return job
+        if job.ext in TEXT_EXTENSIONS:
+            if self.extraction_cache is not None and not job.member:
+                # A listing reused from a scan snapshot carries the previous run's size
+                # and mtime, so key the cache on the file as it is now.
                 try:
-                    (shutil.move if do_move else shutil.copy)(file_path, target_path)
-                    log(f"[{match_type}] {file_path.name} -> {folder_name}", 'file')
-                    return (match_type, file_path, target_path)
-                except Exception as e:
-                    log(f"Error processing {file_path.name}: {e}", 'error')
-                    return ('ERROR', file_path, None)
-            else:
-                log(f"[DRY-RUN] {file_path.name} would go to {folder_name}", 'info')
-                return (match_type, file_path, target_path)
+                    stat = os.stat(job.path)
+                    job.entry = job.entry._replace(size=stat.st_size, mtime=stat.st_mtime)
+                except OSError:
+                    pass
+                job.text = self.extraction_cache.get(job.entry)
+                if job.text is not None:
+                    return job
+            try:
+                job.data = read_entry_bytes(job.entry, self.eml_cache)
+            except OSError:
+                job.data = None
+        return job
+
+    def match_stage(self, job):
+        if self.stop_event.is_set():
+            job.result = ('CANCELLED', job.source, None)
+            return job
+        if job.client_id is None:
+            data = job.data
+            # Archive members keep their bytes for the transfer stage; plain files are re-read from disk.
+            if not job.member:
+                job.data = None
+            text = ""
+            try:
+                if job.text is not None:
+                    text, job.text = job.text, None
+                elif self.region_limits is not None and job.ext in REGION_EXTRACTORS and data:
+                    if self.match_regions(job, data):
+                        job.match_type = "CONTENT"
+                else:
+                    text = self.extract(data, job.ext) if data else ""
+                    if data and self.extraction_cache is not None and not job.member:
+                        self.extraction_cache.put(job.entry, text)
+            except ExtractionSandboxError as e:
+                if job in self.abandoned:
+                    # Already reported as TIMEOUT; the sandbox was closed under it at the end of the run.
+                    return job
+                if self.stop_event.is_set():
+                    job.result = ('CANCELLED', job.source, None)
+                    return job
+                self.log(f"[QUARANTINED] {job.name}: {e}", 'error')
+                job.error = str(e)
+                job.result = ('QUARANTINED', job.source, None)
+                return job
+            if text and self.match(job, text):
+                job.match_type = "CONTENT"
+                job.region = "full"
+        if job.client_id is None:
+            job.data = None
+            self.log(f"[NO MATCH] {job.name}", 'info')
+            job.result = ('NO_MATCH', job.source, None)
+        return job
+
+    def extract(self, data, ext, part=None):
+        if self.sandbox and ext in SANDBOXED_EXTENSIONS:
+            return self.sandbox.extract(data, ext, part, self.region_limits)
+        if part is not None:
+            return extract_regions(data, ext, part, self.region_limits)
+        return extract_text_from_bytes(data, ext)
+
+    def close(self):
+        if self.sandbox:
+            self.sandbox.close()
+        if self.report:
+            self.report.close()
+
+    def transfer_stage(self, job):
+        if self.stop_event.is_set():
+            job.result = ('CANCELLED', job.source, None)
+            return job
+        file_path, match_type = job.source, job.match_type
+        if job.folder is None:
+            folders = [self.folder_names[client_id] for client_id in (job.client_id, *job.extra_client_ids)]
+        else:
+            folders = job.folder.split(PLAN_FOLDER_SEPARATOR)
+            # A planned file is only moved if it is still the file that was reviewed.
+            try:
+                st = job.path.stat()
+                unchanged = st.st_mtime == job.mtime and (job.member or st.st_size == job.size)
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                self.log(f"[STALE] {job.name} changed since the plan was made; skipped", 'error')
+                job.error = "changed since the plan was made"
+                job.result = ('STALE', file_path, None)
+                return job
+        folder_list = ", ".join(folders)
+
+        if not self.dry_run:
+            targets = []
+            written = 0
+            try:
+                for folder in folders:
+                    targets.append(self.destination.reserve(folder, job.name))
+                target_path = targets[0]
+                if job.member:
+                    # Members are written straight from memory; the container itself is never moved.
+                    data, job.data = job.data, None
+                    target_path.write_bytes(data if data is not None else read_entry_bytes(job.entry, self.eml_cache))
+                elif self.do_move:
+                    _move_over(file_path, target_path)
+                else:
+                    shutil.copy(file_path, target_path)
+                written = 1
+                partial = None
+                if len(targets) > 1:
+                    try:
+                        linked = link_or_copy(target_path, targets[1:])
+                        if linked < len(targets) - 1:
+                            folder_list += f" ({len(targets) - 1 - linked} copied, not linked)"
+                    except Exception as e:
+                        # The file is already filed under the first client: keep the links that
+                        # were made, drop the rest, and report the file where it actually is.
+                        missing = [target for target in targets[1:] if not _is_same_file(target, target_path)]
+                        for target in missing:
+                            try:
+                                target.unlink()
+                            except OSError:
+                                pass
+                        partial = f"not filed under {', '.join(target.parent.name for target in missing)}: {e}"
+                written = len(targets)
+                if partial:
+                    job.error = partial
+                    self.log(f"[{match_type}] {job.name} -> {folder_list}; partial: {partial}", 'error')
+                else:
+                    self.log(f"[{match_type}] {job.name} -> {folder_list}", 'file')
+                job.result = (match_type, file_path, target_path)
+            except Exception as e:
+                # Drop the placeholders (or partial copies) of targets that were never written.
+                for target in targets[written:]:
+                    try:
+                        target.unlink()
+                    except OSError:
+                        pass
+                self.log(f"Error processing {job.name}: {e}", 'error')
+                job.error = str(e)
+                job.result = ('ERROR', file_path, None)
         else:
-            log(f"[NO MATCH] {file_path.name}", 'info')
-            return ('NO_MATCH', file_path, None)
+            target_path = self.destination.reserve(folders[0], job.name, create=False)
+            for folder in folders[1:]:
+                self.destination.reserve(folder, job.name, create=False)
+            job.data = None
+            self.log(f"[DRY-RUN] {job.name} would go to {folder_list}", 'info')
+            if self.plan_rows is not None:
+                self.plan_rows.append(PlanRow(str(job.path), PLAN_FOLDER_SEPARATOR.join(folders), match_type,
+                                              job.size, job.mtime, job.member or ""))
+            job.result = (match_type, file_path, target_path)
+        return job
+
+
+def _stage_workers(run, name):
+    climber = run.climbers.get(name)
+    return climber.high if climber else run.limits[name]
+
 
-    total_files = len(files)
-    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+_sequence = itertools.count()
+
+async def _put_job(queue, job):
+    """Queue ``job`` so the most expensive pending file is taken first; None (end of stream) sorts last."""
+    priority = float('inf') if job is None else -job.cost
+    await queue.put((priority, next(_sequence), job))
+
+
+async def _call_with_timeout(loop, executor, func, job, timeout, on_abandoned=None):
+    """Run ``func(job)`` on ``executor``; the clock starts when a thread picks it up, not while it is queued.
+
+    A thread cannot be interrupted, so after a timeout ``func`` keeps running
+    (a read from a hung share may never return); ``on_abandoned`` is called on
+    the event loop once it does finish.
+    """
+    started = asyncio.Event()
+
+    def call():
+        loop.call_soon_threadsafe(started.set)
+        return func(job)
+
+    future = executor.submit(call)
+    await started.wait()
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        if on_abandoned is not None:
+            future.add_done_callback(lambda _: _call_soon_threadsafe(loop, on_abandoned))
+        raise
+
+def _call_soon_threadsafe(loop, callback):
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        # The run has finished and its loop is closed; nothing is left to update.
+        pass
+
+
+async def _run_stage(name, run, gate, in_queue, next_queue, out_queue, executor):
+    loop = asyncio.get_running_loop()
+    stage = getattr(run, f"{name}_stage")
+
+    def func(job):
+        start = time.perf_counter()
+        try:
+            return stage(job)
+        finally:
+            job.timings[name] = time.perf_counter() - start
+    # Transfers are never abandoned half-way; only reading and extraction are timed.
+    timed = run.file_timeout is not None and name != 'transfer'
+
+    async def worker():
+        while True:
+            _, _, job = await in_queue.get()
+            if job is None:
+                return
+            if name == 'read' and job.folder is None:
+                estimate = estimate_memory(job.entry)
+                if estimate:
+                    job.reserved = await run.memory.reserve(estimate)
+            async with gate:
+                if timed:
+                    # The reservation is released only when the thread really finishes, since
+                    # a timed-out read still holds its bytes until then. Both are bound now: this
+                    # worker has moved on to other jobs by the time the thread returns.
+                    def on_abandoned(job=job, reserved=job.reserved):
+                        run.abandoned.pop(job, None)
+                        if reserved:
+                            task = loop.create_task(run.memory.release(reserved))
+                            run.releases.add(task)
+                            task.add_done_callback(run.releases.discard)
+                    try:
+                        job = await _call_with_timeout(loop, executor, func, job, run.file_timeout, on_abandoned)
+                    except asyncio.TimeoutError:
+                        run.log(f"Timed out after {run.file_timeout}s: {job.name}", 'error')
+                        run.abandoned[job] = name
+                        job.reserved = 0
+                        job.error = f"timed out after {run.file_timeout}s in {name}"
+                        job.result = ('TIMEOUT', job.source, None)
+                else:
+                    job = await loop.run_in_executor(executor, func, job)
+            run.completed[name] += 1
+            if job.reserved and (job.result is not None or next_queue is None or (name != 'read' and job.data is None)):
+                await run.memory.release(job.reserved)
+                job.reserved = 0
+            if job.result is not None or next_queue is None:
+                if run.report:
+                    run.report.add(run.report_record(job))
+                await out_queue.put(job.result)
+            else:
+                await _put_job(next_queue, job)
+
+    await asyncio.gather(*(worker() for _ in range(_stage_workers(run, name))))
+    if next_queue is not None:
+        for _ in range(_stage_workers(run, _NEXT_STAGE[name])):
+            await _put_job(next_queue, None)
+
+
+async def _autoscale(run, gates, window, queues):
+    """Periodically hill-climb each stage's limit on its observed files/s."""
+    last_time = time.monotonic()
+    last_completed = Counter(run.completed)
+    while True:
+        await asyncio.sleep(run.autoscale_interval)
+        now = time.monotonic()
+        elapsed = max(now - last_time, 1e-6)
+        changed = False
+        for name, climber in run.climbers.items():
+            rate = (run.completed[name] - last_completed[name]) / elapsed
+            # A stage with nothing queued is starved by its upstream; its rate says nothing about its own limit.
+            if queues[name].qsize() == 0 and gates[name].active < gates[name].limit:
+                continue
+            old_limit = climber.limit
+            new_limit = climber.update(rate)
+            if new_limit != old_limit:
+                run.limits[name] = new_limit
+                await gates[name].set_limit(new_limit)
+                changed = True
+        if changed:
+            await window.set_limit(_window_size(run))
+            logger.debug("Autoscale: %s", _format_limits(run.limits))
+        last_time, last_completed = now, Counter(run.completed)
+
+
+def _window_size(run):
+    return 2 * sum(run.limits[name] for name in _STAGES)
+
+
+def _format_limits(limits):
+    return ", ".join(f"{name}={limits[name]}" for name in _STAGES)
+
+
+
+async def iter_organization_results(config):
+    """Run the organizer pipeline and yield result tuples as files complete.
+
+    Discovery, read, extract/match and transfer each run in their own
+    executor with a concurrency limit taken from ``config``, connected by
+    bounded queues so a slow stage applies back-pressure to the ones before it.
+    """
+    run = _OrganizationRun(config)
+    profile = config.get('profile')
+    profiler = None
+    if profile:
+        profiler = SamplingProfiler(config.get('profile_interval', DEFAULT_PROFILE_INTERVAL))
+        if run.sandbox is not None:
+            run.sandbox.profiler = profiler
+        profiler.start()
+    executors = {name: ThreadPoolExecutor(max_workers=_stage_workers(run, name) if name in _STAGES else limit,
+                                          thread_name_prefix=f"organizer-{name}")
+                 for name, limit in run.limits.items()}
+    tasks = []
+    try:
+        files = await asyncio.to_thread(run.discover, executors['discovery'])
+        if not files:
+            run.log("No valid files found.", 'info')
+            return
+        run.log(f"Found {len(files)} files to process.", 'info')
+        await asyncio.to_thread(run.prepare_destination, files, executors['transfer'])
+
+        if not run.apply_plan:
+            files = schedule_entries(files)
+        queues = {name: asyncio.PriorityQueue(maxsize=run.queue_size) for name in _STAGES}
+        out_queue = asyncio.Queue(maxsize=run.queue_size)
+        gates = {name: _AdaptiveLimit(run.limits[name]) for name in _STAGES}
+        window = _AdaptiveLimit(_window_size(run))
+        if run.autoscale:
+            run.log(f"Starting concurrency: {_format_limits(run.limits)}", 'info')
+
+        async def feed():
+            for entry in files:
+                await window.acquire()
+                job = run.make_job(entry)
+                # Planned files already know their folder and go straight to transfer.
+                await _put_job(queues['read' if job.folder is None else 'transfer'], job)
+            for _ in range(_stage_workers(run, 'read')):
+                await _put_job(queues['read'], None)
+
+        async def stages():
+            await asyncio.gather(*(
+                _run_stage(name, run, gates[name], queues[name], queues.get(_NEXT_STAGE.get(name)),
+                           out_queue, executors[name])
+                for name in _STAGES
+            ))
+            await out_queue.put(None)
+
+        tasks = [asyncio.create_task(feed()), asyncio.create_task(stages())]
+        if run.autoscale:
+            tasks.append(asyncio.create_task(_autoscale(run, gates, window, queues)))
+
+        total_files = len(files)
         done_count = 0
-        for result in executor.map(worker_func, files):
+        while True:
+            result = await out_queue.get()
+            if result is None:
+                break
+            await window.release()
+            done_count += 1
+            run.progress(done_count, total_files)
+            yield result
+
+        if run.plan_rows is not None and not run.stop_event.is_set():
+            try:
+                write_plan(run.plan_path, run.plan_rows)
+                run.log(f"Wrote plan for {len(run.plan_rows)} files to {run.plan_path}", 'info')
+            except OSError as e:
+                run.log(f"Could not write plan: {e}", 'error')
+
+        if run.autoscale and any(climber.last_rate is not None for climber in run.climbers.values()):
+            best = {name: climber.best_limit for name, climber in run.climbers.items()}
+            try:
+                save_tuned_limits(run.src_path, best, run.tuning_file)
+                run.log(f"Best concurrency for this source: {_format_limits(best)} (saved)", 'info')
+            except OSError as e:
+                run.log(f"Could not save concurrency settings: {e}", 'error')
+
+        peak = peak_rss_bytes()
+        mb = 1024 * 1024
+        rss = f"peak RSS {peak / mb:.0f} MB, " if peak else ""
+        run.log(f"Memory: {rss}peak reserved {run.memory.peak / mb:.0f} of {run.memory.limit / mb:.0f} MB budget", 'info')
+        if run.region_hits:
+            scanned = sum(run.region_hits.values())
+            run.log("Matched by region: " + ", ".join(
+                f"{region} {count} ({100 * count / scanned:.0f}%)" for region, count in run.region_hits.most_common()),
+                'info')
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        run.close()
+        # Closing the sandbox ends the parses that timed out in it; let their threads come back
+        # so that only reads that are really stuck are counted below.
+        deadline = time.monotonic() + SANDBOX_SETTLE_TIMEOUT
+        while run.sandbox is not None and time.monotonic() < deadline and any(
+                stage == 'match' and job.ext in SANDBOXED_EXTENSIONS for job, stage in run.abandoned.items()):
+            await asyncio.sleep(0.01)
+        if run.abandoned:
+            run.log(f"{len(run.abandoned)} timed-out file(s) are still being read in the background; "
+                    "this process cannot exit until those reads return.", 'error')
+        if run.report:
+            run.log(f"Wrote report of {run.report.records} files to {run.report.path}", 'info')
+        if profiler is not None:
+            profiler.stop()
+            if profile is True:
+                profile = PROFILE_DIR / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.json"
+            try:
+                run.log(f"Wrote profile to {profiler.write(profile)}", 'info')
+            except OSError as e:
+                run.log(f"Could not write profile: {e}", 'error')
+
+
+async def run_organization_task_async(config):
+    log = config.get('log_callback', lambda msg, cat='info': print(f"[{cat}] {msg}"))
+    stop_event = config.get('stop_event', threading.Event())
+    config = dict(config, stop_event=stop_event)
+
+    stats = Counter()
+    quarantined = []
+    results = iter_organization_results(config)
+    try:
+        async for result in results:
             if stop_event.is_set():
                 log("Processing was cancelled by user.", 'error')
                 return
             stats[result[0]] += 1
-            done_count += 1
-            progress(done_count, total_files)
+            if result[0] == 'QUARANTINED':
+                quarantined.append(result[1].name)
+    finally:
+        await results.aclose()
+
+    if stats:
+        log(f"Completed: {dict(stats)}", 'summary')
+    if quarantined:
+        log(f"Quarantined {len(quarantined)} file(s): {', '.join(quarantined)}", 'summary')
+    return stats
 
-    log(f"Completed: {dict(stats)}", 'summary')
+
+def run_organization_task(config):
+    """Run the pipeline to completion; returns the result Counter, or None if cancelled."""
+    return asyncio.run(run_organization_task_async(config))
+
+
+# Sharded runs: a coordinator splits discovery output into manifests in a shared
+# queue directory, and any number of workers (processes or hosts) claim them.
+#
+#   <queue>/job.json            destination, clients and options shared by all workers
+#   <queue>/pending/<shard>     manifests waiting to be claimed
+#   <queue>/leased/<shard>@<id> claimed by worker <id>; mtime is the lease heartbeat
+#   <queue>/done/<shard>        per-shard result counts written by the worker
+#   <queue>/plans/<shard>.tsv   dry runs only: the shard's plan, merged into <queue>/plan.tsv
+DEFAULT_SHARD_SIZE = 1000
+DEFAULT_LEASE_TIMEOUT = 300
+
+
+def _queue_dirs(queue_dir):
+    queue_dir = Path(queue_dir)
+    return queue_dir / "pending", queue_dir / "leased", queue_dir / "done"
+
+def create_shard_queue(config, queue_dir, shard_size=DEFAULT_SHARD_SIZE):
+    """Discover files under config['src_path'] and write them as shard manifests; returns the shard count."""
+    pending, leased, done = _queue_dirs(queue_dir)
+    for directory in (pending, leased, done):
+        directory.mkdir(parents=True, exist_ok=True)
+    entries = schedule_entries(collect_file_entries(config['src_path']))
+    shard_count = max(1, -(-len(entries) // shard_size)) if entries else 0
+    # Deal the cost-sorted entries round-robin so every shard gets a similar mix of large and small files.
+    shards = [entries[i::shard_count] for i in range(shard_count)]
+    job = {
+        'src_path': str(config['src_path']),
+        'dest_path': str(config['dest_path']),
+        'do_move': config['do_move'],
+        'dry_run': config.get('dry_run', False),
+        'clients': [list(client) for client in config['clients_list']],
+        'aliases': config.get('aliases') or {},
+    }
+    _write_json_file(Path(queue_dir) / "job.json", job)
+    for index, shard in enumerate(shards):
+        manifest = {'files': [[str(entry.path), entry.size, entry.mtime, entry.member] for entry in shard]}
+        _write_json_file(pending / f"shard-{index:05d}.json", manifest)
+    return shard_count
+
+def reclaim_stale_leases(queue_dir, lease_timeout=DEFAULT_LEASE_TIMEOUT):
+    """Return shards whose lease heartbeat is older than ``lease_timeout`` to the pending directory."""
+    pending, leased, done = _queue_dirs(queue_dir)
+    reclaimed = 0
+    now = time.time()
+    for lease in leased.glob("*@*"):
+        shard_name = lease.name.split("@", 1)[0]
+        try:
+            if now - lease.stat().st_mtime < lease_timeout:
+                continue
+            if (done / shard_name).exists():
+                lease.unlink()
+            else:
+                os.rename(lease, pending / shard_name)
+                reclaimed += 1
+        except OSError:
+            continue
+    return reclaimed
+
+def claim_shard(queue_dir, worker_id):
+    """Atomically lease one pending shard; returns the lease path, or None if nothing is pending."""
+    pending, leased, _ = _queue_dirs(queue_dir)
+    for manifest in sorted(pending.glob("shard-*.json")):
+        lease = leased / f"{manifest.name}@{worker_id}"
+        try:
+            # rename keeps the old mtime, which reclaim_stale_leases would read as an
+            # expired heartbeat; touch first so the lease is fresh the moment it appears.
+            os.utime(manifest)
+            os.rename(manifest, lease)
+        except OSError:
+            continue
+        try:
+            os.utime(lease)
+        except FileNotFoundError:
+            # Reclaimed by another worker already; the claim is lost.
+            continue
+        return lease
+    return None
+
+def _hold_lease(lease, interval, stop):
+    while not stop.wait(interval):
+        try:
+            os.utime(lease)
+        except OSError:
+            return
+
+def run_shard_worker(queue_dir, worker_id=None, lease_timeout=DEFAULT_LEASE_TIMEOUT, config=None):
+    """Claim and process shards until the queue is drained; returns this worker's combined Counter.
+
+    ``config`` may override run options (callbacks, stage limits, stop_event);
+    destination, clients and move/dry-run settings come from job.json.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    _, leased, done = _queue_dirs(queue_dir)
+    job = _read_json_file(Path(queue_dir) / "job.json")
+    base_config = dict(config or {})
+    base_config.update(
+        src_path=job['src_path'],
+        dest_path=job['dest_path'],
+        do_move=job['do_move'],
+        dry_run=job['dry_run'],
+        clients_list=[Client(*client) for client in job['clients']],
+        aliases=job.get('aliases') or {},
+    )
+    stop_event = base_config.setdefault('stop_event', threading.Event())
+    totals = Counter()
+
+    while not stop_event.is_set():
+        reclaim_stale_leases(queue_dir, lease_timeout)
+        lease = claim_shard(queue_dir, worker_id)
+        if lease is None:
+            if not any(leased.glob("*@*")):
+                break
+            # Other workers still hold shards; wait in case one of them dies and its lease expires.
+            stop_event.wait(min(lease_timeout / 3, 10))
+            continue
+
+        shard_name = lease.name.split("@", 1)[0]
+        manifest = _read_json_file(lease)
+        entries = [FileEntry(Path(path), *rest) for path, *rest in manifest.get('files', [])]
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=_hold_lease, args=(lease, lease_timeout / 3, heartbeat_stop), daemon=True)
+        heartbeat.start()
+        shard_config = dict(base_config, file_entries=entries)
+        if job['dry_run']:
+            # One plan per shard; merge_shard_results combines them once every shard is done.
+            shard_config['plan_path'] = Path(queue_dir) / "plans" / f"{Path(shard_name).stem}.tsv"
+        try:
+            stats = run_organization_task(shard_config)
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+        if stats is None:
+            # Cancelled: leave the lease to expire so another worker picks the shard up.
+            break
+        _write_json_file(done / shard_name, {'worker': worker_id, 'stats': dict(stats)})
+        try:
+            lease.unlink()
+        except OSError:
+            pass
+        totals.update(stats)
+    return totals
+
+def merge_shard_results(queue_dir):
+    """Combine every finished shard into one summary dict.
+
+    For a dry run, once no shard is pending or leased the per-shard plans are
+    merged into <queue>/plan.tsv and its path is returned as 'plan_path'.
+    """
+    pending, leased, done = _queue_dirs(queue_dir)
+    stats = Counter()
+    workers = set()
+    for result_file in done.glob("shard-*.json"):
+        result = _read_json_file(result_file)
+        stats.update(result.get('stats', {}))
+        workers.add(result.get('worker'))
+    summary = {
+        'stats': dict(stats),
+        'shards_done': sum(1 for _ in done.glob("shard-*.json")),
+        'shards_pending': sum(1 for _ in pending.glob("shard-*.json")),
+        'shards_leased': sum(1 for _ in leased.glob("*@*")),
+        'workers': sorted(w for w in workers if w),
+    }
+    plans = sorted((Path(queue_dir) / "plans").glob("shard-*.tsv"))
+    if plans and not summary['shards_pending'] and not summary['shards_leased']:
+        merged = Path(queue_dir) / "plan.tsv"
+        merge_plans(plans, merged)
+        summary['plan_path'] = str(merged)
+    return summary
+
+def read_client_config(config_file=CONFIG_DIR / "config.ini"):
+    """Load the GUI's saved client list from config.ini."""
+    import configparser
+    parser = configparser.ConfigParser()
+    parser.read(config_file)
+    clients = []
+    if 'Clients' in parser:
+        for value in parser['Clients'].values():
+            parts = value.split()
+            if len(parts) == 2:
+                clients.append(Client(parts[0], "", parts[1]))
+            elif len(parts) == 3:
+                clients.append(Client(parts[0], parts[1], parts[2]))
+    return clients
+
+
+def read_alias_config(config_file=CONFIG_DIR / "config.ini"):
+    """Load the optional [Aliases] section, e.g. ``william = bill, will``."""
+    import configparser
+    parser = configparser.ConfigParser()
+    parser.read(config_file)
+    if 'Aliases' not in parser:
+        return {}
+    return {name: [alias.strip() for alias in value.split(",") if alias.strip()]
+            for name, value in parser['Aliases'].items()}
+
+
+def read_service_url(config_file=CONFIG_DIR / "config.ini"):
+    """Return ``url`` from the optional [Service] section, e.g. ``url = http://127.0.0.1:8765``, or None."""
+    import configparser
+    parser = configparser.ConfigParser()
+    parser.read(config_file)
+    return parser.get('Service', 'url', fallback=None) or None
+
+
+def _cli(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Lawyer File Organizer engine")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    coordinate = commands.add_parser('coordinate', help="split a source tree into shard manifests")
+    coordinate.add_argument('--src', required=True)
+    coordinate.add_argument('--dest', required=True)
+    coordinate.add_argument('--queue', required=True)
+    coordinate.add_argument('--clients-file', default=str(CONFIG_DIR / "config.ini"))
+    coordinate.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    coordinate.add_argument('--move', action='store_true')
+    coordinate.add_argument('--dry-run', action='store_true')
+
+    work = commands.add_parser('work', help="claim and process shards until the queue is empty")
+    work.add_argument('--queue', required=True)
+    work.add_argument('--worker-id')
+    work.add_argument('--lease-timeout', type=float, default=DEFAULT_LEASE_TIMEOUT)
+
+    status = commands.add_parser('status', help="print the merged summary of a sharded run")
+    status.add_argument('--queue', required=True)
+
+    apply = commands.add_parser('apply', help="execute a plan written by a dry run")
+    apply.add_argument('--plan', required=True)
+    apply.add_argument('--dest', required=True)
+    apply.add_argument('--move', action='store_true')
+
+    profile = commands.add_parser('profile-summary', help="print the hot spots of a profile written by a run")
+    profile.add_argument('profile')
+    profile.add_argument('--top', type=int, default=20)
+
+    plan_diff = commands.add_parser('plan-diff', help="list files whose planned destination changed")
+    plan_diff.add_argument('old')
+    plan_diff.add_argument('new')
+
+    args = parser.parse_args(argv)
+    log_config = {
+        'log_callback': lambda msg, cat='info': logger.info(msg),
+    }
+    if args.command == 'coordinate':
+        config = {
+            'src_path': args.src,
+            'dest_path': args.dest,
+            'clients_list': read_client_config(args.clients_file),
+            'aliases': read_alias_config(args.clients_file),
+            'do_move': args.move,
+            'dry_run': args.dry_run,
+        }
+        count = create_shard_queue(config, args.queue, args.shard_size)
+        logger.info(f"Wrote {count} shards to {args.queue}")
+    elif args.command == 'work':
+        stats = run_shard_worker(args.queue, args.worker_id, args.lease_timeout, log_config)
+        logger.info(f"Worker finished: {dict(stats)}")
+    elif args.command == 'status':
+        print(json.dumps(merge_shard_results(args.queue), indent=2))
+    elif args.command == 'apply':
+        run_organization_task(dict(log_config, apply_plan=args.plan, dest_path=args.dest, do_move=args.move))
+    elif args.command == 'profile-summary':
+        print(summarize_profile(args.profile, args.top))
+    elif args.command == 'plan-diff':
+        for change, old, new in diff_plans(args.old, args.new):
+            row = new or old
+            detail = f"{old.folder} -> {new.folder}" if change == 'changed' else row.folder
+            print(f"{change}\t{row.source}\t{detail}")
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        _cli(sys.argv[1:])
+        sys.exit(0)
     clients = [Client('Pranav', '', 'doe'), Client('Abhijit', '', 'None')]
     stop_event = threading.Event()
 
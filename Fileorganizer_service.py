@@ -0,0 +1,480 @@
+"""Local HTTP/JSON service that keeps the organizer engine warm between runs.
+
+    python Fileorganizer_service.py [--host 127.0.0.1] [--port 8765]
+
+The client matchers and an extraction cache stay in memory, so repeated runs
+skip rebuilding the automaton and re-parsing unchanged files. Jobs run one at
+a time so concurrent submissions do not compete for the same share, and a job
+identical to one already queued or running is coalesced into it.
+
+    POST /jobs                          submit a job; returns {"id", "coalesced"}
+    GET  /jobs                          list jobs
+    GET  /jobs/<id>                     state, progress and result counts
+    GET  /jobs/<id>/events?since=N&wait=S
+                                        events after N, waiting up to S seconds for one
+    POST /jobs/<id>/cancel              request cancellation
+    GET  /health
+
+Every request must carry ``Authorization: Bearer <token>``, where the token
+is ``token`` in the [Service] section of config.ini or, if that is not set,
+the contents of ~/.LawyerFileOrganizer/service-token (created on first
+start). Requests whose Host or Origin is not this machine are refused, and
+POST bodies must be application/json, so a web page cannot drive the service.
+Output files (reports, plans, profiles) are always written under
+~/.LawyerFileOrganizer; clients cannot choose their paths.
+"""
+import argparse
+import configparser
+import hashlib
+import hmac
+import json
+import os
+import queue
+import secrets
+import threading
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import Fileorganizer_python as organizer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_MATCHERS = 4
+MAX_EVENTS = 10000
+MAX_FINISHED_JOBS = 50
+MAX_EVENT_WAIT = 30.0
+
+TOKEN_FILE = organizer.CONFIG_DIR / "service-token"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# Engine options a submission may set besides src_path, dest_path, clients and aliases.
+# 'report' and 'profile' are booleans: the service picks where those files go.
+JOB_OPTIONS = (
+    'do_move', 'dry_run', 'apply_plan', 'multi_client', 'archives', 'file_timeout',
+    'memory_budget_mb', 'precreate_folders', 'sandbox_extraction', 'read_workers', 'match_workers',
+    'transfer_workers', 'autoscale', 'profile', 'report', 'incremental_scan', 'full_rescan',
+    'match_regions',
+)
+FINAL_STATES = ('done', 'cancelled', 'failed')
+_BOOL_OPTIONS = ('do_move', 'dry_run', 'multi_client', 'archives', 'precreate_folders', 'sandbox_extraction',
+                 'autoscale', 'profile', 'report', 'incremental_scan', 'full_rescan')
+_NUMBER_OPTIONS = ('file_timeout', 'memory_budget_mb')
+_COUNT_OPTIONS = ('read_workers', 'match_workers', 'transfer_workers')
+_REGION_LIMIT_KEYS = ('pdf_pages', 'docx_paragraphs', 'text_kb')
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def validate_job_request(request):
+    """Raise ValueError describing the first problem with a job submission, so it is refused before queueing."""
+    if not isinstance(request, dict):
+        raise ValueError("the job must be a JSON object")
+    unknown = set(request) - {'src_path', 'dest_path', 'clients', 'aliases', *JOB_OPTIONS}
+    if unknown:
+        raise ValueError(f"unknown options: {', '.join(sorted(unknown))}")
+    for option in ('src_path', 'dest_path', 'apply_plan'):
+        if request.get(option) is not None and not isinstance(request[option], str):
+            raise ValueError(f"{option} must be a string")
+    if not request.get('dest_path') or not (request.get('src_path') or request.get('apply_plan')):
+        raise ValueError("src_path (or apply_plan) and dest_path are required")
+    clients = request.get('clients', [])
+    if not isinstance(clients, list) or not all(
+            isinstance(client, list) and len(client) == 3 and all(isinstance(part, str) for part in client)
+            for client in clients):
+        raise ValueError("clients must be a list of [first, middle, last] string lists")
+    aliases = request.get('aliases') or {}
+    if not isinstance(aliases, dict) or not all(
+            isinstance(names, list) and all(isinstance(name, str) for name in names) for names in aliases.values()):
+        raise ValueError("aliases must map names to lists of strings")
+    for option in _BOOL_OPTIONS:
+        if not isinstance(request.get(option, False), bool):
+            raise ValueError(f"{option} must be true or false")
+    for option in _NUMBER_OPTIONS:
+        if request.get(option) is not None and not (_is_number(request[option]) and request[option] > 0):
+            raise ValueError(f"{option} must be a positive number")
+    for option in _COUNT_OPTIONS:
+        value = request.get(option)
+        if value is not None and not (isinstance(value, int) and not isinstance(value, bool) and value > 0):
+            raise ValueError(f"{option} must be a positive integer")
+    regions = request.get('match_regions')
+    if regions is not None and not isinstance(regions, bool) and not (
+            isinstance(regions, dict) and set(regions) <= set(_REGION_LIMIT_KEYS)
+            and all(_is_number(value) and value > 0 for value in regions.values())):
+        raise ValueError(f"match_regions must be true, false or a dict of {', '.join(_REGION_LIMIT_KEYS)}")
+
+
+def load_service_token(config_file=organizer.CONFIG_DIR / "config.ini", token_file=TOKEN_FILE, create=False):
+    """Return the service token from config.ini or ``token_file``; with ``create``, generate the file if missing."""
+    parser = configparser.ConfigParser()
+    parser.read(config_file)
+    token = parser.get('Service', 'token', fallback=None)
+    if token:
+        return token
+    token_file = Path(token_file)
+    try:
+        return token_file.read_text(encoding='utf-8').strip() or None
+    except FileNotFoundError:
+        if not create:
+            return None
+    token = secrets.token_urlsafe(32)
+    token_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    return token
+
+
+class ServiceJob:
+    """A submitted run and the events it has produced so far."""
+
+    def __init__(self, job_id, key, request):
+        self.id = job_id
+        self.key = key
+        self.request = request
+        self.state = 'queued'
+        self.progress = (0, 0)
+        self.stats = None
+        self.error = None
+        self.stop_event = threading.Event()
+        self.report_path = (organizer.REPORT_DIR / f"service-job-{key[:12]}-{job_id}.csv"
+                            if request.get('report') else None)
+        self.events = []
+        self.first_seq = 0
+        self.cond = threading.Condition()
+
+    def add_event(self, event):
+        with self.cond:
+            event['seq'] = self.first_seq + len(self.events)
+            self.events.append(event)
+            if len(self.events) > MAX_EVENTS:
+                drop = len(self.events) - MAX_EVENTS
+                del self.events[:drop]
+                self.first_seq += drop
+            self.cond.notify_all()
+
+    def set_state(self, state):
+        with self.cond:
+            self.state = state
+        self.add_event({'type': 'state', 'state': state})
+
+    def events_since(self, since, wait=0.0):
+        """Return events numbered ``since`` or later, waiting up to ``wait`` seconds if there are none yet."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.first_seq + len(self.events) > since or self.state in FINAL_STATES,
+                               timeout=min(wait, MAX_EVENT_WAIT))
+            return self.events[max(0, since - self.first_seq):]
+
+    def summary(self):
+        return {
+            'id': self.id,
+            'state': self.state,
+            'src_path': self.request.get('src_path'),
+            'dest_path': self.request.get('dest_path'),
+            'progress': list(self.progress),
+            'report_path': str(self.report_path) if self.report_path else None,
+            'stats': self.stats,
+            'error': self.error,
+        }
+
+
+def job_key(request):
+    """Hash of everything that affects a run, so identical submissions can share one job."""
+    canonical = dict(request)
+    if canonical.get('src_path'):
+        canonical['src_path'] = str(Path(canonical['src_path']).resolve())
+    canonical['dest_path'] = str(Path(canonical['dest_path']).resolve())
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class OrganizerService:
+    """Job queue plus the matchers and extraction cache shared by every run."""
+
+    def __init__(self, extraction_cache_mb=organizer.DEFAULT_EXTRACTION_CACHE_MB):
+        self.extraction_cache = organizer.ExtractionCache(extraction_cache_mb)
+        self._matchers = OrderedDict()
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._ids = 0
+        self._runner = threading.Thread(target=self._run_jobs, daemon=True)
+        self._runner.start()
+
+    def matcher(self, clients, aliases):
+        key = organizer.matcher_key(clients, aliases)
+        with self._lock:
+            matcher = self._matchers.get(key)
+            if matcher is not None:
+                self._matchers.move_to_end(key)
+                return matcher
+        matcher = organizer.load_matcher(clients, aliases)
+        with self._lock:
+            self._matchers[key] = matcher
+            while len(self._matchers) > MAX_MATCHERS:
+                self._matchers.popitem(last=False)
+        return matcher
+
+    def submit(self, request):
+        """Queue a job, or return the queued/running job with the same key; returns (job, coalesced)."""
+        validate_job_request(request)
+        key = job_key(request)
+        with self._lock:
+            job = self._active.get(key)
+            if job is not None:
+                return job, True
+            self._ids += 1
+            job = ServiceJob(str(self._ids), key, request)
+            self._jobs[job.id] = job
+            self._active[key] = job
+            finished = [old for old in self._jobs.values() if old.state in FINAL_STATES]
+            for old in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self._jobs[old.id]
+        self._queue.put(job)
+        return job, False
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.stop_event.set()
+        return job
+
+    def _run_jobs(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                with self._lock:
+                    self._active.pop(job.key, None)
+
+    def _run(self, job):
+        if job.stop_event.is_set():
+            job.set_state('cancelled')
+            return
+        job.set_state('running')
+        request = job.request
+        try:
+            clients = [organizer.Client(*client) for client in request.get('clients', [])]
+            aliases = request.get('aliases') or {}
+            config = {option: request[option] for option in JOB_OPTIONS if option in request}
+            config.pop('report', None)
+            config.update({
+                'report_path': job.report_path,
+                'src_path': request.get('src_path'),
+                'dest_path': request['dest_path'],
+                'clients_list': clients,
+                'aliases': aliases,
+                'do_move': request.get('do_move', False),
+                'extraction_cache': self.extraction_cache,
+                'stop_event': job.stop_event,
+                'log_callback': lambda msg, cat='info': job.add_event({'type': 'log', 'message': msg, 'category': cat}),
+                'progress_callback': lambda done, total: setattr(job, 'progress', (done, total)),
+            })
+            if not request.get('apply_plan'):
+                config['matcher'] = self.matcher(clients, aliases)
+            stats = organizer.run_organization_task(config)
+        except Exception as e:
+            organizer.logger.exception("Job %s failed", job.id)
+            job.error = str(e)
+            job.add_event({'type': 'log', 'message': f"Job failed: {e}", 'category': 'error'})
+            job.set_state('failed')
+            return
+        if stats is None or job.stop_event.is_set():
+            job.set_state('cancelled')
+        else:
+            job.stats = dict(stats)
+            job.set_state('done')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None
+    token = None
+    allowed_hosts = LOCAL_HOSTS
+
+    def _authorized(self, post=False):
+        """Refuse requests from other hosts, cross-site pages, and callers without the token."""
+        host = urlparse(f"//{self.headers.get('Host', '')}").hostname
+        if host not in self.allowed_hosts:
+            self._send(403, {'error': "forbidden host"})
+            return False
+        origin = self.headers.get('Origin')
+        if origin is not None and urlparse(origin).hostname not in self.allowed_hosts:
+            self._send(403, {'error': "forbidden origin"})
+            return False
+        supplied = self.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode('utf-8'), f"Bearer {self.token}".encode('utf-8')):
+            self._send(401, {'error': "missing or wrong token"})
+            return False
+        if post and self.headers.get_content_type() != 'application/json':
+            self._send(415, {'error': "expected application/json"})
+            return False
+        return True
+
+    def log_message(self, format, *args):
+        organizer.logger.debug(format, *args)
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _job(self, parts):
+        job = self.service.get(parts[1])
+        if job is None:
+            self._send(404, {'error': f"no job {parts[1]}"})
+        return job
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if parts == ['health']:
+            cache = self.service.extraction_cache
+            self._send(200, {'status': 'ok', 'cache': {'hits': cache.hits, 'misses': cache.misses,
+                                                      'chars': cache.chars}})
+        elif parts == ['jobs']:
+            self._send(200, {'jobs': [job.summary() for job in self.service.jobs()]})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self._job(parts)
+            if job is not None:
+                self._send(200, job.summary())
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events':
+            job = self._job(parts)
+            if job is not None:
+                query = parse_qs(url.query)
+                try:
+                    since = int(query.get('since', ['0'])[0])
+                    wait = float(query.get('wait', ['0'])[0])
+                    if since < 0 or not 0 <= wait < float('inf'):
+                        raise ValueError
+                except ValueError:
+                    self._send(400, {'error': "since must be a non-negative integer and wait a number of seconds"})
+                    return
+                events = job.events_since(since, wait)
+                self._send(200, dict(job.summary(), events=events, next=events[-1]['seq'] + 1 if events else since))
+        else:
+            self._send(404, {'error': "not found"})
+
+    def do_POST(self):
+        if not self._authorized(post=True):
+            return
+        parts = [part for part in urlparse(self.path).path.split('/') if part]
+        if parts == ['jobs']:
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                job, coalesced = self.service.submit(json.loads(self.rfile.read(length) or b'{}'))
+            except (ValueError, TypeError) as e:
+                self._send(400, {'error': str(e)})
+                return
+            self._send(202, {'id': job.id, 'coalesced': coalesced,
+                             'report_path': str(job.report_path) if job.report_path else None})
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+            job = self._job(parts)
+            if job is not None:
+                self.service.cancel(job.id)
+                self._send(202, job.summary())
+        else:
+            self._send(404, {'error': "not found"})
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None, token=None):
+    """Return a ThreadingHTTPServer for ``service`` (a new OrganizerService by default); call serve_forever() on it.
+
+    ``token`` defaults to load_service_token(create=True).
+    """
+    allowed_hosts = LOCAL_HOSTS if host in LOCAL_HOSTS or host in ("", "0.0.0.0", "::") else LOCAL_HOSTS + (host,)
+    handler = type('Handler', (_Handler,), {
+        'service': service or OrganizerService(),
+        'token': token or load_service_token(create=True),
+        'allowed_hosts': allowed_hosts,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class ServiceClient:
+    """Minimal client for the service, used by the GUI when a service URL is configured."""
+
+    def __init__(self, url, token=None, timeout=10.0):
+        self.url = url.rstrip('/')
+        self.token = token or load_service_token()
+        self.timeout = timeout
+
+    def _request(self, method, path, body=None, timeout=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json',
+                                                  'Authorization': f"Bearer {self.token}"})
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+            return json.loads(response.read())
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def submit(self, request):
+        return self._request('POST', '/jobs', request)
+
+    def status(self, job_id):
+        return self._request('GET', f'/jobs/{job_id}')
+
+    def events(self, job_id, since=0, wait=1.0):
+        return self._request('GET', f'/jobs/{job_id}/events?since={since}&wait={wait}',
+                             timeout=self.timeout + wait)
+
+    def cancel(self, job_id):
+        return self._request('POST', f'/jobs/{job_id}/cancel', {})
+
+
+def job_request(config):
+    """Turn a run_organization_task config into a JSON job submission."""
+    request = {option: str(config[option]) if isinstance(config[option], Path) else config[option]
+               for option in JOB_OPTIONS if option in config and config[option] is not None}
+    request['report'] = bool(config.get('report_path'))
+    request['profile'] = bool(config.get('profile'))
+    request.update({
+        'src_path': str(config['src_path']) if config.get('src_path') else None,
+        'dest_path': str(config['dest_path']),
+        'clients': [list(client) for client in config.get('clients_list', [])],
+        'aliases': config.get('aliases') or {},
+    })
+    return request
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lawyer File Organizer service")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-mb', type=int, default=organizer.DEFAULT_EXTRACTION_CACHE_MB,
+                        help="memory for cached extracted text")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, OrganizerService(args.cache_mb))
+    organizer.logger.info(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    main()
@@ -1,13 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, Toplevel, ttk, messagebox, filedialog
 import os
+import importlib.util
 import configparser
+import multiprocessing
 import threading
 from datetime import datetime
 from pathlib import Path
 import Fileorganizer_python as organizer
 from Fileorganizer_python import Client
 from collections import deque
+from itertools import islice
 import time
 
 class LawyerFileOrganizerUI(tk.Tk):
@@ -24,6 +27,12 @@ class LawyerFileOrganizerUI(tk.Tk):
         self.config_parser = configparser.ConfigParser()
 
         self.client_list = []
+        self._client_filter_job = None
+        self._config_save_lock = threading.Lock()
+        self._config_save_generation = 0
+        self.last_report_path = None
+        self.report_index = None
+        self.report_start = 0
         
         self.processing_thread = None
         self.stop_event = threading.Event()
@@ -50,6 +59,7 @@ class LawyerFileOrganizerUI(tk.Tk):
         self.create_widgets()
 
         self.load_clients_from_config()
+        self.warm_matcher_cache()
         
         self.after(100, self.center_window)
 
@@ -122,12 +132,15 @@ class LawyerFileOrganizerUI(tk.Tk):
         self.notebook.pack(fill="both", expand=True)
 
         self.organize_files_tab = ttk.Frame(self.notebook, style="TFrame")
+        self.report_tab = ttk.Frame(self.notebook, style="TFrame")
         self.settings_tab = ttk.Frame(self.notebook, style="TFrame")
 
         self.notebook.add(self.organize_files_tab, text="Organize Files")
+        self.notebook.add(self.report_tab, text="Run Report")
         self.notebook.add(self.settings_tab, text="Settings")
 
         self.create_organize_files_tab()
+        self.create_report_tab()
         self.create_settings_tab()
 
         self.create_status_bar()
@@ -179,31 +192,29 @@ class LawyerFileOrganizerUI(tk.Tk):
 
         ttk.Button(client_input_frame, text="Batch Import", command=self.batch_import_clients).pack(side="left")
 
+        filter_frame = ttk.Frame(client_manager_frame, style="TFrame")
+        filter_frame.pack(fill="x")
+        ttk.Label(filter_frame, text="Filter:", style="TLabel").pack(side="left", padx=(0, 8))
+        self.client_filter_var = tk.StringVar()
+        self.client_filter_var.trace_add("write", lambda *_: self._schedule_client_filter())
+        ttk.Entry(filter_frame, textvariable=self.client_filter_var, width=30).pack(side="left", padx=(0, 8))
+        ttk.Button(filter_frame, text="Remove Selected", command=self.remove_selected_clients).pack(side="left")
+        self.client_list_label = ttk.Label(filter_frame, text="", style="TLabel", foreground="gray")
+        self.client_list_label.pack(side="right")
+
+        # A Treeview holding at most CLIENT_LIST_MAX_ROWS rows, so a roster of any
+        # size renders instantly; the filter narrows it down to the clients wanted.
         list_container = ttk.Frame(client_manager_frame, style="TFrame")
         list_container.pack(fill="x", pady=8)
-
-        self.client_canvas = tk.Canvas(list_container, height=180, bg="#f9fafb", highlightthickness=0, borderwidth=1, relief="solid", highlightbackground="#d1d5db")
-        self.client_canvas.pack(side="left", fill="x", expand=True)
-
-        scrollbar = ttk.Scrollbar(list_container, orient="vertical", command=self.client_canvas.yview)
+        self.client_tree = ttk.Treeview(list_container, show="tree", height=8)
+        self.client_tree.pack(side="left", fill="x", expand=True)
+        scrollbar = ttk.Scrollbar(list_container, orient="vertical", command=self.client_tree.yview)
         scrollbar.pack(side="right", fill="y")
+        self.client_tree.configure(yscrollcommand=scrollbar.set)
+        self.client_tree.bind("<Delete>", lambda event: self.remove_selected_clients())
+        self.shown_clients = []
 
-        self.client_canvas.configure(yscrollcommand=scrollbar.set)
-
-        self.clients_frame = ttk.Frame(self.client_canvas, style="TFrame")
-        self.client_canvas.create_window((0, 0), window=self.clients_frame, anchor="nw")
-
-        def on_frame_configure(event):
-            self.client_canvas.configure(scrollregion=self.client_canvas.bbox("all"))
-
-        def on_mousewheel(event):
-            self.client_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-
-        self.clients_frame.bind("<Configure>", on_frame_configure)
-        self.client_canvas.bind("<MouseWheel>", on_mousewheel)
-        self.clients_frame.bind("<MouseWheel>", on_mousewheel)
-
-        self.show_empty_client_list()
+        self.update_client_list_ui()
 
         processing_frame = ttk.LabelFrame(self.organize_files_tab, text="Processing Controls", padding=12)
         processing_frame.pack(fill="x", padx=10, pady=8)
@@ -211,6 +222,12 @@ class LawyerFileOrganizerUI(tk.Tk):
         self.move_files_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(processing_frame, text="Move files instead of copy", 
                     variable=self.move_files_var, style="TCheckbutton").pack(anchor="w", pady=6)
+        self.multi_client_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(processing_frame, text="File documents naming several clients under each of them",
+                    variable=self.multi_client_var, style="TCheckbutton").pack(anchor="w", pady=(0, 6))
+        self.incremental_scan_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(processing_frame, text="Quick rescan: skip folders unchanged since the last run\n(files edited in place there keep their old size and date until a full rescan)",
+                    variable=self.incremental_scan_var, style="TCheckbutton").pack(anchor="w", pady=(0, 6))
 
         button_frame = ttk.Frame(processing_frame, style="TFrame")
         button_frame.pack(fill="x", pady=8)
@@ -267,6 +284,80 @@ class LawyerFileOrganizerUI(tk.Tk):
         entry.bind("<FocusOut>", on_focus_out)
         entry.bind("<Return>", on_return)
 
+    def create_report_tab(self):
+        controls = ttk.Frame(self.report_tab, style="TFrame")
+        controls.pack(fill="x", padx=10, pady=8)
+        ttk.Button(controls, text="Open Last Run", command=lambda: self.open_report(self.last_report_path)).pack(side="left", padx=(0, 8))
+        ttk.Button(controls, text="Open Report...", command=self.browse_report).pack(side="left", padx=(0, 8))
+        self.report_next_btn = ttk.Button(controls, text="Next ▶", command=lambda: self.show_report_page(1), state="disabled")
+        self.report_next_btn.pack(side="right")
+        self.report_page_label = ttk.Label(controls, text="No report loaded", style="TLabel")
+        self.report_page_label.pack(side="right", padx=8)
+        self.report_prev_btn = ttk.Button(controls, text="◀ Previous", command=lambda: self.show_report_page(-1), state="disabled")
+        self.report_prev_btn.pack(side="right")
+
+        table_frame = ttk.Frame(self.report_tab, style="TFrame")
+        table_frame.pack(fill="both", expand=True, padx=10, pady=(0, 8))
+        self.report_tree = ttk.Treeview(table_frame, columns=organizer.REPORT_FIELDS, show="headings")
+        for field in organizer.REPORT_FIELDS:
+            self.report_tree.heading(field, text=field.replace("_", " ").title())
+            wide = field in ("source", "target", "error")
+            self.report_tree.column(field, width=320 if wide else 90, stretch=wide)
+        y_scroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.report_tree.yview)
+        x_scroll = ttk.Scrollbar(table_frame, orient="horizontal", command=self.report_tree.xview)
+        self.report_tree.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        y_scroll.pack(side="right", fill="y")
+        x_scroll.pack(side="bottom", fill="x")
+        self.report_tree.pack(fill="both", expand=True)
+
+    def browse_report(self):
+        file_path = filedialog.askopenfilename(
+            title="Select Run Report", initialdir=organizer.REPORT_DIR,
+            filetypes=[("Run Reports", "*.csv *.jsonl")]
+        )
+        if file_path:
+            self.open_report(file_path)
+
+    def open_report(self, report_path):
+        """Index the report in the background, then show its first page."""
+        if not report_path or not Path(report_path).exists():
+            messagebox.showinfo("Run Report", "No report is available yet.")
+            return
+        self.report_page_label.config(text="Indexing report...")
+
+        def index():
+            try:
+                report = organizer.ReportIndex(report_path)
+            except (OSError, ValueError) as e:
+                self.after(0, lambda err=e: messagebox.showerror("Run Report", f"Could not read report: {err}"))
+                return
+            self.after(0, lambda: self._show_report(report))
+
+        threading.Thread(target=index, daemon=True).start()
+
+    def _show_report(self, report):
+        self.report_index = report
+        self.report_start = 0
+        self.show_report_page(0)
+
+    def show_report_page(self, step):
+        report = self.report_index
+        if report is None:
+            return
+        last_start = max(0, (len(report) - 1) // REPORT_PAGE_SIZE * REPORT_PAGE_SIZE)
+        self.report_start = min(max(0, self.report_start + step * REPORT_PAGE_SIZE), last_start)
+        records = report.page(self.report_start, REPORT_PAGE_SIZE)
+        self.report_tree.delete(*self.report_tree.get_children())
+        for record in records:
+            self.report_tree.insert("", "end", values=[record[field] for field in organizer.REPORT_FIELDS])
+        if records:
+            self.report_page_label.config(text=f"Files {self.report_start + 1:,}-{self.report_start + len(records):,} "
+                                               f"of {len(report):,}")
+        else:
+            self.report_page_label.config(text="Report is empty")
+        self.report_prev_btn.config(state="normal" if self.report_start > 0 else "disabled")
+        self.report_next_btn.config(state="normal" if self.report_start < last_start else "disabled")
+
     def create_settings_tab(self):
         file_settings_frame = ttk.LabelFrame(self.settings_tab, text="File Processing Settings", padding=12)
         file_settings_frame.pack(fill="x", padx=10, pady=8)
@@ -291,19 +382,18 @@ class LawyerFileOrganizerUI(tk.Tk):
         deps_frame = ttk.LabelFrame(self.settings_tab, text="Dependencies", padding=12)
         deps_frame.pack(fill="x", padx=10, pady=8)
         
-        try:
-            import PyPDF2
+        # find_spec locates the parsers without importing them, keeping the window fast to open.
+        if importlib.util.find_spec("PyPDF2"):
             pdf_status = "✓ PyPDF2 installed"
             pdf_color = "green"
-        except ImportError:
+        else:
             pdf_status = "✗ PyPDF2 not installed (PDF processing disabled)"
             pdf_color = "red"
         
-        try:
-            from docx import Document
+        if importlib.util.find_spec("docx"):
             docx_status = "✓ python-docx installed"
             docx_color = "green"
-        except ImportError:
+        else:
             docx_status = "✗ python-docx not installed (DOCX processing disabled)"
             docx_color = "red"
         
@@ -313,14 +403,6 @@ class LawyerFileOrganizerUI(tk.Tk):
         docx_label = ttk.Label(deps_frame, text=docx_status, style="TLabel")
         docx_label.pack(anchor="w", pady=2)
 
-    def show_empty_client_list(self):
-        for widget in self.clients_frame.winfo_children():
-            widget.destroy()
-            
-        empty_label = ttk.Label(self.clients_frame, text="No clients configured. Add clients using the field above.", 
-                              style="TLabel", foreground="gray")
-        empty_label.pack(pady=20)
-
     def browse_source_dir(self):
         directory = filedialog.askdirectory(title="Select Source Directory")
         if directory:
@@ -345,14 +427,9 @@ class LawyerFileOrganizerUI(tk.Tk):
         if not client_name:
             return
         
-        parts = client_name.split()
-        client_obj = None
+        client_obj = parse_client_name(client_name)
         
-        if len(parts) == 2:
-            client_obj = Client(parts[0].lower(), "", parts[1].lower())
-        elif len(parts) == 3:
-            client_obj = Client(parts[0].lower(), parts[1].lower(), parts[2].lower())
-        else:
+        if client_obj is None:
             messagebox.showerror("Invalid Name Format", 
                                "Please enter name as 'First Last' or 'First Middle Last'.")
             return
@@ -369,50 +446,51 @@ class LawyerFileOrganizerUI(tk.Tk):
         self.save_clients_to_config()
         self.log_activity(f"Added client: {client_name}", "info")
 
-    def remove_client(self, client):
-        if client in self.client_list:
-            self.client_list.remove(client)
-            self.update_client_list_ui()
-            display_name = organizer.get_client_display_name(client)
-            self.save_clients_to_config()
-            self.log_activity(f"Removed client: {display_name}", "info")
+    def _schedule_client_filter(self):
+        # Filtering scans the whole roster, so wait until typing pauses.
+        if self._client_filter_job is not None:
+            self.after_cancel(self._client_filter_job)
+        self._client_filter_job = self.after(CLIENT_FILTER_DELAY_MS, self._apply_client_filter)
+
+    def _apply_client_filter(self):
+        self._client_filter_job = None
+        self.update_client_list_ui()
+
+    def remove_selected_clients(self):
+        selected = [self.shown_clients[int(iid)] for iid in self.client_tree.selection()]
+        if not selected:
+            return
+        removing = set(selected)
+        self.client_list = [client for client in self.client_list if client not in removing]
+        self.update_client_list_ui()
+        self.save_clients_to_config()
+        names = ", ".join(organizer.get_client_display_name(client) for client in selected[:5])
+        more = f" and {len(selected) - 5} more" if len(selected) > 5 else ""
+        self.log_activity(f"Removed client(s): {names}{more}", "info")
 
     def update_client_list_ui(self):
+        """Show up to CLIENT_LIST_MAX_ROWS clients matching the filter; the rest stay out of the widget."""
         if hasattr(self, 'client_count_label'):
-            self.client_count_label.config(text=f"{len(self.client_list)} clients configured")
-        
-        for widget in self.clients_frame.winfo_children():
-            widget.destroy()
-
-        if not self.client_list:
-            self.show_empty_client_list()
+            self.client_count_label.config(text=f"{len(self.client_list):,} clients configured")
+        if not hasattr(self, 'client_tree'):
             return
+        needle = self.client_filter_var.get().strip().lower()
+        names = ((client, organizer.get_client_display_name(client)) for client in self.client_list)
+        if needle:
+            names = ((client, name) for client, name in names if needle in name.lower())
+        shown = list(islice(names, CLIENT_LIST_MAX_ROWS))
+        self.shown_clients = [client for client, _ in shown]
+        self.client_tree.delete(*self.client_tree.get_children())
+        for i, (_, name) in enumerate(shown):
+            self.client_tree.insert("", "end", iid=str(i), text=name)
 
-        for client in self.client_list:
-            display_name = organizer.get_client_display_name(client)
-            
-            client_card = tk.Frame(self.clients_frame, bg="white", relief="solid", 
-                                 borderwidth=1, padx=8, pady=4)
-            client_card.pack(fill="x", pady=2, padx=2)
-            
-            name_label = tk.Label(client_card, text=display_name, bg="white", 
-                                font=("Segoe UI", 9), anchor="w")
-            name_label.pack(side="left", fill="x", expand=True)
-            
-            remove_btn = tk.Button(client_card, text="×", font=("Arial", 12, "bold"),
-                                 fg="#dc2626", bg="white", relief="flat",
-                                 command=lambda c=client: self.remove_client(c),
-                                 cursor="hand2")
-            remove_btn.pack(side="right")
-            
-            def on_enter(e, btn=remove_btn):
-                btn.config(bg="#fef2f2")
-                
-            def on_leave(e, btn=remove_btn):
-                btn.config(bg="white")
-                
-            remove_btn.bind("<Enter>", on_enter)
-            remove_btn.bind("<Leave>", on_leave)
+        if not self.client_list:
+            text = "No clients configured. Add clients using the field above."
+        elif len(shown) < CLIENT_LIST_MAX_ROWS:
+            text = f"{len(shown):,} shown" if needle else ""
+        else:
+            text = f"Showing the first {CLIENT_LIST_MAX_ROWS:,}; type in the filter to find others"
+        self.client_list_label.config(text=text)
 
     def load_clients_from_config(self):
         if not self.config_file.exists():
@@ -433,17 +511,46 @@ class LawyerFileOrganizerUI(tk.Tk):
                 self.update_client_list_ui()
                 self.log_activity(f"Loaded {len(loaded_clients)} clients from config.", "info")
 
+    def warm_matcher_cache(self):
+        """Load (or build) the matcher for the saved clients in the background so the first run starts immediately."""
+        if not self.client_list:
+            return
+        clients = list(self.client_list)
+
+        def warm():
+            try:
+                organizer.load_matcher(clients, organizer.read_alias_config(self.config_file))
+            except Exception:
+                pass
+
+        threading.Thread(target=warm, daemon=True).start()
+
     def save_clients_to_config(self):
-        self.config_parser['Clients'] = {}
-        for i, client in enumerate(self.client_list):
-            name_str = " ".join(filter(None, client))
-            self.config_parser['Clients'][f'client_{i}'] = name_str
-        
-        try:
-            with open(self.config_file, 'w') as f:
-                self.config_parser.write(f)
-        except Exception as e:
-            self.log_activity(f"Error saving client list: {e}", "error")
+        """Write the client list to config.ini on a background thread; the latest save wins."""
+        generation = self._next_config_save()
+        clients = list(self.client_list)
+        threading.Thread(target=self._write_clients_config, args=(clients, generation), daemon=True).start()
+
+    def _next_config_save(self):
+        with self._config_save_lock:
+            self._config_save_generation += 1
+            return self._config_save_generation
+
+    def _write_clients_config(self, clients, generation):
+        """Write ``clients`` as the [Clients] section unless a newer save has been requested. Any thread."""
+        with self._config_save_lock:
+            if generation != self._config_save_generation:
+                return
+            parser = configparser.ConfigParser()
+            parser.read(self.config_file)
+            parser['Clients'] = {f'client_{i}': " ".join(filter(None, client)) for i, client in enumerate(clients)}
+            tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+            try:
+                with open(tmp_file, 'w') as f:
+                    parser.write(f)
+                os.replace(tmp_file, self.config_file)
+            except Exception as e:
+                self.after(0, self.log_activity, f"Error saving client list: {e}", "error")
 
     def get_timestamp(self):
         return datetime.now().strftime("%H:%M:%S")
@@ -631,23 +738,62 @@ class LawyerFileOrganizerUI(tk.Tk):
         self.log_activity("Processing started...", "info")
         self.progress_bar["value"] = 0
         
+        self.last_report_path = organizer.REPORT_DIR / f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv"
         config = {
             'src_path': Path(source_dir),
             'dest_path': Path(dest_dir),
             'clients_list': self.client_list,
+            'aliases': organizer.read_alias_config(self.config_file),
             'do_move': self.move_files_var.get(),
+            'multi_client': self.multi_client_var.get(),
+            'incremental_scan': self.incremental_scan_var.get(),
+            'report_path': self.last_report_path,
             'log_callback': self.post_log_message,
             'progress_callback': self.post_progress_update,
             'stop_event': self.stop_event
         }
         
+        service_url = organizer.read_service_url(self.config_file)
         self.processing_thread = threading.Thread(
-            target=organizer.run_organization_task,
-            args=(config,),
+            target=self._run_via_service if service_url else organizer.run_organization_task,
+            args=(service_url, config) if service_url else (config,),
             daemon=True
         )
         self.processing_thread.start()
 
+    def _run_via_service(self, service_url, config):
+        """Run the job on the local service and relay its events; falls back to a local run if it is down."""
+        from Fileorganizer_service import FINAL_STATES, ServiceClient, job_request
+        client = ServiceClient(service_url)
+        try:
+            submitted = client.submit(job_request(config))
+        except OSError as e:
+            self.post_log_message(f"Service at {service_url} unavailable ({e}); running locally.", "error")
+            organizer.run_organization_task(config)
+            return
+        job_id = submitted['id']
+        if submitted.get('report_path'):
+            self.last_report_path = Path(submitted['report_path'])
+        since, cancelled = 0, False
+        while True:
+            if self.stop_event.is_set() and not cancelled:
+                client.cancel(job_id)
+                cancelled = True
+            try:
+                response = client.events(job_id, since, wait=1.0)
+            except OSError as e:
+                self.post_log_message(f"Lost contact with the service: {e}", "error")
+                return
+            for event in response['events']:
+                if event['type'] == 'log':
+                    self.post_log_message(event['message'], event['category'])
+            since = response['next']
+            done, total = response['progress']
+            if total:
+                self.post_progress_update(done, total)
+            if response['state'] in FINAL_STATES:
+                return
+
     def pause_processing(self):
         if self.pause_event.is_set():
             self.pause_event.clear()
@@ -673,12 +819,6 @@ class LawyerFileOrganizerUI(tk.Tk):
         self.toggle_controls(processing=False)
 
     def batch_import_clients(self):
-        import csv
-        try:
-            from openpyxl import load_workbook
-        except ImportError:
-            load_workbook = None
-        
         file_path = filedialog.askopenfilename(
             title="Select Client List File",
             filetypes=[("Supported Files", "*.txt *.csv *.xlsx")]
@@ -686,261 +826,196 @@ class LawyerFileOrganizerUI(tk.Tk):
         if not file_path:
             return
 
-        new_clients = set()
-        duplicates = 0
-        added = 0
-
+        ext = Path(file_path).suffix.lower()
         try:
-            ext = Path(file_path).suffix.lower()
+            if ext == ".xlsx" and importlib.util.find_spec("openpyxl") is None:
+                messagebox.showerror("Missing Dependency", 
+                    "openpyxl is not installed. Excel import is disabled.\n\n"
+                    "Install with: pip install openpyxl")
+                return
 
             if ext == ".txt":
-                with open(file_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        name = line.strip()
-                        if name:
-                            new_clients.add(name)
-
-            elif ext == ".csv":
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    data = [row for row in reader if any(cell.strip() for cell in row)]
-                
-                if not data:
-                    messagebox.showwarning("Empty File", "The CSV contains no data.")
-                    return
-
-                # Ask for orientation
-                orientation_window = Toplevel(self)
-                orientation_window.title("Select Orientation")
-                orientation_window.geometry("300x150")
-                orientation_window.transient(self)
-                orientation_window.grab_set()
-
-                tk.Label(orientation_window, text="How are client names arranged?").pack(pady=10)
-                orientation_choice = tk.StringVar(value="column")
-
-                ttk.Radiobutton(orientation_window, text="Single Column", variable=orientation_choice, value="column").pack(anchor="w", padx=40)
-                ttk.Radiobutton(orientation_window, text="Single Row", variable=orientation_choice, value="row").pack(anchor="w", padx=40)
-
-                confirmed = tk.BooleanVar(value=False)
-
-                def confirm_orientation():
-                    confirmed.set(True)
-                    orientation_window.destroy()
-
-                ttk.Button(orientation_window, text="Next", command=confirm_orientation).pack(pady=10)
-                orientation_window.wait_variable(confirmed)
-                orientation = orientation_choice.get()
-
-                if orientation == "column":
-                    # Get column headers
-                    col_window = Toplevel(self)
-                    col_window.title("Select Column")
-                    col_window.geometry("300x200")
-                    col_window.transient(self)
-                    col_window.grab_set()
-
-                    ttk.Label(col_window, text="Select the column with client names:").pack(pady=10)
-                    
-                    # Get column count from first row
-                    num_cols = len(data[0])
-                    columns = [f"Column {i+1}" for i in range(num_cols)]
-                    col_choice = tk.StringVar(value=columns[0])
-
-                    col_dropdown = ttk.Combobox(col_window, textvariable=col_choice, values=columns, state="readonly")
-                    col_dropdown.pack(pady=5)
-
-                    skip_header_var = tk.BooleanVar(value=False)
-                    ttk.Checkbutton(col_window, text="First row is header (skip)", variable=skip_header_var).pack(pady=5)
-
-                    confirm = tk.BooleanVar(value=False)
-
-                    def confirm_column():
-                        confirm.set(True)
-                        col_window.destroy()
-
-                    ttk.Button(col_window, text="Import", command=confirm_column).pack(pady=10)
-                    col_window.wait_variable(confirm)
-
-                    # Extract column index
-                    col_idx = int(col_choice.get().split()[-1]) - 1
-                    start_row = 1 if skip_header_var.get() else 0
-
-                    for row in data[start_row:]:
-                        if col_idx < len(row):
-                            val = row[col_idx].strip()
-                            if val:
-                                new_clients.add(val)
-
-                else:  # row orientation
-                    row_window = Toplevel(self)
-                    row_window.title("Select Row")
-                    row_window.geometry("300x200")
-                    row_window.transient(self)
-                    row_window.grab_set()
-
-                    ttk.Label(row_window, text="Select the row with client names:").pack(pady=10)
-                    row_indices = [f"Row {i+1}" for i in range(len(data))]
-                    row_choice = tk.StringVar(value=row_indices[0])
-
-                    row_dropdown = ttk.Combobox(row_window, textvariable=row_choice, values=row_indices, state="readonly")
-                    row_dropdown.pack(pady=5)
-
-                    skip_first_var = tk.BooleanVar(value=False)
-                    ttk.Checkbutton(row_window, text="First column is header (skip)", variable=skip_first_var).pack(pady=5)
-
-                    confirm = tk.BooleanVar(value=False)
-
-                    def confirm_row():
-                        confirm.set(True)
-                        row_window.destroy()
-
-                    ttk.Button(row_window, text="Import", command=confirm_row).pack(pady=10)
-                    row_window.wait_variable(confirm)
-
-                    idx = int(row_choice.get().split()[-1]) - 1
-                    start_col = 1 if skip_first_var.get() else 0
-                    
-                    for val in data[idx][start_col:]:
-                        val = val.strip()
-                        if val:
-                            new_clients.add(val)
-
-            elif ext == ".xlsx":
-                if not load_workbook:
-                    messagebox.showerror("Missing Dependency", 
-                        "openpyxl is not installed. Excel import is disabled.\n\n"
-                        "Install with: pip install openpyxl")
-                    return
-                
-                wb = load_workbook(file_path, read_only=True, data_only=True)
-                ws = wb.active
-                data = [[cell if cell is not None else "" for cell in row] for row in ws.iter_rows(values_only=True)]
-                data = [row for row in data if any(str(cell).strip() for cell in row)]
-                
-                if not data:
-                    messagebox.showwarning("Empty File", "The spreadsheet contains no data.")
+                selection = ("column", 0, False)
+            else:
+                sample = list(islice(iter_roster_rows(file_path), ROSTER_PREVIEW_ROWS))
+                if not sample:
+                    messagebox.showwarning("Empty File", "The file contains no data.")
                     return
+                selection = self.ask_roster_selection(sample)
+        except Exception as e:
+            messagebox.showerror("Import Error", f"Failed to import clients: {e}")
+            self.log_activity(f"Batch import failed: {e}", "error")
+            return
 
-                # Ask for orientation
-                orientation_window = Toplevel(self)
-                orientation_window.title("Select Orientation")
-                orientation_window.geometry("300x150")
-                orientation_window.transient(self)
-                orientation_window.grab_set()
-
-                tk.Label(orientation_window, text="How are client names arranged?").pack(pady=10)
-                orientation_choice = tk.StringVar(value="column")
-
-                ttk.Radiobutton(orientation_window, text="Single Column", variable=orientation_choice, value="column").pack(anchor="w", padx=40)
-                ttk.Radiobutton(orientation_window, text="Single Row", variable=orientation_choice, value="row").pack(anchor="w", padx=40)
-
-                confirmed = tk.BooleanVar(value=False)
-
-                def confirm_orientation():
-                    confirmed.set(True)
-                    orientation_window.destroy()
-
-                ttk.Button(orientation_window, text="Next", command=confirm_orientation).pack(pady=10)
-                orientation_window.wait_variable(confirmed)
-                orientation = orientation_choice.get()
-
-                if orientation == "column":
-                    col_window = Toplevel(self)
-                    col_window.title("Select Column")
-                    col_window.geometry("300x200")
-                    col_window.transient(self)
-                    col_window.grab_set()
-
-                    ttk.Label(col_window, text="Select the column with client names:").pack(pady=10)
-                    
-                    num_cols = len(data[0])
-                    columns = [f"Column {i+1}" for i in range(num_cols)]
-                    col_choice = tk.StringVar(value=columns[0])
-
-                    col_dropdown = ttk.Combobox(col_window, textvariable=col_choice, values=columns, state="readonly")
-                    col_dropdown.pack(pady=5)
-
-                    skip_header_var = tk.BooleanVar(value=False)
-                    ttk.Checkbutton(col_window, text="First row is header (skip)", variable=skip_header_var).pack(pady=5)
+        self.status_label.config(text="Importing clients...")
+        threading.Thread(target=self._import_roster_worker, args=(file_path, selection, list(self.client_list)),
+                         daemon=True).start()
+
+    def ask_roster_selection(self, sample):
+        """Ask which column or row holds client names, using only a preview of the file."""
+        orientation_window = Toplevel(self)
+        orientation_window.title("Select Orientation")
+        orientation_window.geometry("300x150")
+        orientation_window.transient(self)
+        orientation_window.grab_set()
+
+        tk.Label(orientation_window, text="How are client names arranged?").pack(pady=10)
+        orientation_choice = tk.StringVar(value="column")
+
+        ttk.Radiobutton(orientation_window, text="Single Column", variable=orientation_choice, value="column").pack(anchor="w", padx=40)
+        ttk.Radiobutton(orientation_window, text="Single Row", variable=orientation_choice, value="row").pack(anchor="w", padx=40)
+
+        confirmed = tk.BooleanVar(value=False)
+
+        def confirm_orientation():
+            confirmed.set(True)
+            orientation_window.destroy()
+
+        ttk.Button(orientation_window, text="Next", command=confirm_orientation).pack(pady=10)
+        orientation_window.wait_variable(confirmed)
+        orientation = orientation_choice.get()
+
+        window = Toplevel(self)
+        window.title("Select Column" if orientation == "column" else "Select Row")
+        window.geometry("360x200")
+        window.transient(self)
+        window.grab_set()
+
+        if orientation == "column":
+            ttk.Label(window, text="Select the column with client names:").pack(pady=10)
+            num_cols = max(len(row) for row in sample)
+            choices = []
+            for i in range(num_cols):
+                example = next((row[i] for row in sample if i < len(row) and row[i]), "")
+                choices.append(f"Column {i+1}" + (f" (e.g. {example[:30]})" if example else ""))
+            skip_text = "First row is header (skip)"
+        else:
+            ttk.Label(window, text=f"Select the row with client names (first {len(sample)} shown):").pack(pady=10)
+            choices = [f"Row {i+1}" + (f" (e.g. {row[0][:30]})" if row and row[0] else "") for i, row in enumerate(sample)]
+            skip_text = "First column is header (skip)"
 
-                    confirm = tk.BooleanVar(value=False)
+        choice = tk.StringVar(value=choices[0])
+        ttk.Combobox(window, textvariable=choice, values=choices, state="readonly", width=40).pack(pady=5)
 
-                    def confirm_column():
-                        confirm.set(True)
-                        col_window.destroy()
+        skip_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(window, text=skip_text, variable=skip_var).pack(pady=5)
 
-                    ttk.Button(col_window, text="Import", command=confirm_column).pack(pady=10)
-                    col_window.wait_variable(confirm)
+        confirm = tk.BooleanVar(value=False)
 
-                    col_idx = int(col_choice.get().split()[-1]) - 1
-                    start_row = 1 if skip_header_var.get() else 0
+        def confirm_selection():
+            confirm.set(True)
+            window.destroy()
 
-                    for row in data[start_row:]:
-                        if col_idx < len(row):
-                            val = str(row[col_idx]).strip()
-                            if val:
-                                new_clients.add(val)
+        ttk.Button(window, text="Import", command=confirm_selection).pack(pady=10)
+        window.wait_variable(confirm)
 
-                else:  # row orientation
-                    row_window = Toplevel(self)
-                    row_window.title("Select Row")
-                    row_window.geometry("300x200")
-                    row_window.transient(self)
-                    row_window.grab_set()
+        return orientation, choices.index(choice.get()), skip_var.get()
 
-                    ttk.Label(row_window, text="Select the row with client names:").pack(pady=10)
-                    row_indices = [f"Row {i+1}" for i in range(len(data))]
-                    row_choice = tk.StringVar(value=row_indices[0])
+    def _import_roster_worker(self, file_path, selection, existing):
+        """Stream the roster, merge it into ``existing`` and save config.ini off the UI thread.
 
-                    row_dropdown = ttk.Combobox(row_window, textvariable=row_choice, values=row_indices, state="readonly")
-                    row_dropdown.pack(pady=5)
+        The UI thread only receives the finished client list.
+        """
+        orientation, index, skip_first = selection
+        new_clients = set()
+        rows_read = 0
+        rows = iter_roster_rows(file_path)
+        try:
+            if orientation == "column":
+                if skip_first:
+                    next(rows, None)
+                for row in rows:
+                    rows_read += 1
+                    if index < len(row) and row[index]:
+                        new_clients.add(row[index])
+                    if rows_read % ROSTER_PROGRESS_EVERY == 0:
+                        self.after(0, self.status_label.config, {"text": f"Importing clients... {rows_read:,} rows read"})
+            else:
+                row = next(islice(rows, index, None), [])
+                new_clients.update(val for val in row[1 if skip_first else 0:] if val)
+        except Exception as e:
+            self.after(0, self._finish_roster_import, None, e)
+            return
+        finally:
+            rows.close()
 
-                    skip_first_var = tk.BooleanVar(value=False)
-                    ttk.Checkbutton(row_window, text="First column is header (skip)", variable=skip_first_var).pack(pady=5)
+        parsed = [client for client in map(parse_client_name, new_clients) if client]
+        known = set(existing)
+        added_clients = [client for client in parsed if client not in known]
+        clients = existing + added_clients
+        self._write_clients_config(clients, self._next_config_save())
+        self.after(0, self._finish_roster_import, (existing, clients, len(parsed) - len(added_clients)), None)
 
-                    confirm = tk.BooleanVar(value=False)
+    def _finish_roster_import(self, result, error):
+        self.status_label.config(text="Ready")
+        if error is not None:
+            messagebox.showerror("Import Error", f"Failed to import clients: {error}")
+            self.log_activity(f"Batch import failed: {error}", "error")
+            return
 
-                    def confirm_row():
-                        confirm.set(True)
-                        row_window.destroy()
+        existing, clients, duplicates = result
+        added = len(clients) - len(existing)
+        if self.client_list == existing:
+            self.client_list = clients
+        else:
+            # Clients were added or removed while the roster was importing; merge and save again.
+            known = set(self.client_list)
+            self.client_list.extend(client for client in clients[len(existing):] if client not in known)
+            self.save_clients_to_config()
 
-                    ttk.Button(row_window, text="Import", command=confirm_row).pack(pady=10)
-                    row_window.wait_variable(confirm)
+        self.update_client_list_ui()
+        messagebox.showinfo("Import Complete", f"Import successful.\n{added} new clients added.\n{duplicates} duplicates skipped.")
+        self.log_activity(f"Batch import complete: {added} added, {duplicates} duplicates skipped.", "success")
 
-                    idx = int(row_choice.get().split()[-1]) - 1
-                    start_col = 1 if skip_first_var.get() else 0
-                    
-                    for val in data[idx][start_col:]:
-                        val = str(val).strip()
-                        if val:
-                            new_clients.add(val)
 
-            # Process all collected names
-            for name in new_clients:
-                parts = name.split()
-                if len(parts) == 2:
-                    client_obj = Client(parts[0].lower(), "", parts[1].lower())
-                elif len(parts) == 3:
-                    client_obj = Client(parts[0].lower(), parts[1].lower(), parts[2].lower())
-                else:
-                    continue
+REPORT_PAGE_SIZE = 500
+CLIENT_LIST_MAX_ROWS = 1000
+CLIENT_FILTER_DELAY_MS = 250
+ROSTER_PREVIEW_ROWS = 50
+ROSTER_PROGRESS_EVERY = 5000
 
-                if client_obj not in self.client_list:
-                    self.client_list.append(client_obj)
-                    added += 1
-                else:
-                    duplicates += 1
 
-            self.update_client_list_ui()
-            self.save_clients_to_config()
-            messagebox.showinfo("Import Complete", f"Import successful.\n{added} new clients added.\n{duplicates} duplicates skipped.")
-            self.log_activity(f"Batch import complete: {added} added, {duplicates} duplicates skipped.", "success")
+def iter_roster_rows(file_path):
+    """Yield non-empty rows of a client roster as lists of stripped strings, one at a time.
 
-        except Exception as e:
-            messagebox.showerror("Import Error", f"Failed to import clients: {e}")
-            self.log_activity(f"Batch import failed: {e}", "error")
+    CSV is read with csv.reader and XLSX with openpyxl in read-only mode, so a
+    large roster is never held in memory; TXT yields one single-cell row per line.
+    """
+    ext = Path(file_path).suffix.lower()
+    if ext == ".xlsx":
+        from openpyxl import load_workbook
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for row in wb.active.iter_rows(values_only=True):
+                values = ["" if cell is None else str(cell).strip() for cell in row]
+                if any(values):
+                    yield values
+        finally:
+            wb.close()
+    elif ext == ".csv":
+        import csv
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                values = [cell.strip() for cell in row]
+                if any(values):
+                    yield values
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                name = line.strip()
+                if name:
+                    yield [name]
+
+
+def parse_client_name(name):
+    parts = name.split()
+    if len(parts) == 2:
+        return Client(parts[0].lower(), "", parts[1].lower())
+    elif len(parts) == 3:
+        return Client(parts[0].lower(), parts[1].lower(), parts[2].lower())
+    return None
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = LawyerFileOrganizerUI()
     app.mainloop()
\ No newline at end of file
@@ -20,15 +20,16 @@ a = Analysis(
         'PyPDF2',  # PDF processing
         'docx',  # python-docx for DOCX files
         'ahocorasick',  # Fast string matching (optional)
-        'openpyxl',  # For Excel file reading (pandas dependency)
-        'xlrd',  # For older Excel formats
+        'openpyxl',  # For Excel client import (imported lazily in batch_import_clients)
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
     excludes=[
         'matplotlib',  # Exclude unused heavy libraries
-        'numpy.random._examples',
+        'numpy',  # Optional for openpyxl, unused here; keeps the one-file bundle small to unpack
+        'pandas',
+        'xlrd',
         'IPython',
         'jupyter',
     ],
@@ -0,0 +1,83 @@
+"""Measure GUI cold-start time.
+
+Reports the slowest imports from ``python -X importtime`` and the time from
+process launch until the main window has been drawn, and exits non-zero if
+time-to-first-window is above the target.
+
+    python startup_benchmark.py [--runs 5] [--target-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+FIRST_WINDOW_SNIPPET = """
+import PythonLawUI
+app = PythonLawUI.LawyerFileOrganizerUI()
+app.update()
+print("WINDOW_READY", flush=True)
+app.destroy()
+"""
+
+
+def import_times(module="PythonLawUI"):
+    """Return [(cumulative_us, self_us, module)] from a fresh ``-X importtime`` run."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def time_to_first_window():
+    """Return milliseconds from launch until the window is drawn, or None if no display is available."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", FIRST_WINDOW_SNIPPET],
+        cwd=HERE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    for line in proc.stdout:
+        if line.strip() == "WINDOW_READY":
+            elapsed = (time.perf_counter() - start) * 1000
+            proc.wait()
+            return elapsed
+    proc.wait()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = import_times()
+    total = next((cumulative for cumulative, _, name in rows if name.strip() == "PythonLawUI"), None)
+    print("Slowest imports (cumulative, self) for 'import PythonLawUI':")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms {self_us / 1000:8.1f} ms  {name}")
+    if total is not None:
+        print(f"Total import time: {total / 1000:.1f} ms")
+
+    samples = [t for t in (time_to_first_window() for _ in range(args.runs)) if t is not None]
+    if not samples:
+        print("Time to first window: skipped (no display available)")
+        return 0
+    median = statistics.median(samples)
+    print(f"Time to first window: median {median:.0f} ms over {len(samples)} runs (target {args.target_ms:.0f} ms)")
+    return 0 if median <= args.target_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import Fileorganizer_python as organizer  # noqa: E402
+
+BUDGETS_FILE = Path(__file__).with_name("perf_budgets.json")
+
+FIRST_NAMES = ["james", "mary", "robert", "patricia", "john", "jennifer", "michael", "linda", "david", "elizabeth",
+               "william", "barbara", "richard", "susan", "joseph", "jessica", "thomas", "sarah", "charles", "karen"]
+LAST_NAMES = ["smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis", "rodriguez", "martinez",
+              "hernandez", "lopez", "gonzalez", "wilson", "anderson", "thomas", "taylor", "moore", "jackson", "martin"]
+FILLER = ("the court finds that plaintiff defendant motion hereby ordered agreement party counsel filed "
+          "exhibit section pursuant witness hearing record transcript judgment appeal notice").split()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: throughput test checked against tests/perf_budgets.json")
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path_factory, monkeypatch):
+    """Point the organizer's config directory and the caches under it at a temporary directory."""
+    config_dir = tmp_path_factory.mktemp("config")
+    monkeypatch.setattr(organizer, "CONFIG_DIR", config_dir)
+    monkeypatch.setattr(organizer, "MATCHER_CACHE_DIR", config_dir / "matchers")
+    monkeypatch.setattr(organizer, "SCAN_SNAPSHOT_DIR", config_dir / "scans")
+    monkeypatch.setattr(organizer, "DEFAULT_PLAN_FILE", config_dir / "last-plan.tsv")
+    monkeypatch.setattr(organizer, "REPORT_DIR", config_dir / "reports")
+    monkeypatch.setattr(organizer, "TUNING_FILE", config_dir / "tuning.json")
+    monkeypatch.setattr(organizer, "PROFILE_DIR", config_dir / "profiles")
+    return config_dir
+
+
+def make_clients(count, seed=0):
+    """Return ``count`` distinct clients with realistic, overlapping first and last names."""
+    rng = random.Random(seed)
+    clients = []
+    seen = set()
+    while len(clients) < count:
+        client = organizer.Client(rng.choice(FIRST_NAMES), "", f"{rng.choice(LAST_NAMES)}{len(clients)}")
+        if client not in seen:
+            seen.add(client)
+            clients.append(client)
+    return clients
+
+
+def make_text(size, seed=0, names=()):
+    """Return about ``size`` characters of filler prose with ``names`` placed near the end."""
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(FILLER) if rng.random() > 0.05 else rng.choice(FIRST_NAMES).capitalize()
+        words.append(word)
+        length += len(word) + 1
+    for offset, name in enumerate(names, 1):
+        words.insert(len(words) - offset * 10, name)
+    return " ".join(words)
+
+
+@pytest.fixture(scope="session")
+def perf_budget():
+    """Return a checker that fails when a measurement exceeds its budget.
+
+    Budgets are multiples of a fixed pure-Python calibration loop timed on the
+    machine running the tests, so they hold on slow and fast hardware alike.
+    """
+    with open(BUDGETS_FILE, encoding="utf-8") as f:
+        budgets = json.load(f)
+    loops = budgets["calibration_loops"]
+
+    def calibration_loop():
+        start = time.perf_counter()
+        total = 0
+        for i in range(loops):
+            total += i * i % 7
+        return time.perf_counter() - start
+
+    calibration = min(calibration_loop() for _ in range(3))
+
+    def check(name, func, repeat=3, setup=None):
+        """Time ``func`` ``repeat`` times; with ``setup``, each run is ``func(setup())`` and setup is untimed."""
+        budget = budgets["budgets"][name]
+        elapsed = min(_timed(func, setup) for _ in range(repeat))
+        ratio = elapsed / calibration
+        assert ratio <= budget, (f"{name}: {elapsed * 1000:.1f} ms is {ratio:.2f}x the calibration loop "
+                                 f"({calibration * 1000:.1f} ms); budget is {budget}x")
+        return ratio
+
+    return check
+
+
+def _timed(func, setup=None):
+    args = (setup(),) if setup else ()
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
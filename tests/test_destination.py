@@ -0,0 +1,101 @@
+import json
+import os
+
+import Fileorganizer_python as organizer
+from Fileorganizer_python import Client, DestinationIndex, get_unique_filepath, link_or_copy, run_organization_task
+
+
+def test_unique_filepath_without_collision(tmp_path):
+    assert get_unique_filepath(tmp_path, "a.pdf") == tmp_path / "a.pdf"
+
+
+def test_unique_filepath_counts_past_existing_names(tmp_path):
+    for name in ("a.pdf", "a_1.pdf", "a_2.pdf"):
+        (tmp_path / name).touch()
+    assert get_unique_filepath(tmp_path, "a.pdf") == tmp_path / "a_3.pdf"
+    assert get_unique_filepath(tmp_path, "b.pdf") == tmp_path / "b.pdf"
+
+
+def test_destination_index_reserves_distinct_names(tmp_path):
+    (tmp_path / "doe_john").mkdir()
+    (tmp_path / "doe_john" / "a.pdf").touch()
+    index = DestinationIndex(tmp_path)
+    names = [index.reserve("doe_john", "a.pdf").name for _ in range(3)]
+    assert names == ["a_1.pdf", "a_2.pdf", "a_3.pdf"]
+    assert index.reserve("roe_jane", "a.pdf") == tmp_path / "roe_jane" / "a.pdf"
+    assert (tmp_path / "roe_jane").is_dir()
+
+
+def test_destination_index_ignores_case_where_the_filesystem_does(tmp_path):
+    index = DestinationIndex(tmp_path)
+    index.prepare(["doe_john"])
+    first = index.reserve("doe_john", "A.pdf")
+    second = index.reserve("doe_john", "a.pdf")
+    assert first != second
+    if os.path.normcase("A") == os.path.normcase("a"):
+        assert second.name == "a_1.pdf"
+
+
+def test_link_or_copy_writes_every_target(tmp_path):
+    source = tmp_path / "src.txt"
+    source.write_text("joint filing")
+    targets = [tmp_path / "one.txt", tmp_path / "two.txt"]
+    link_or_copy(source, targets)
+    assert all(target.read_text() == "joint filing" for target in targets)
+
+
+def test_separate_indexes_never_share_a_target(tmp_path):
+    first, second = DestinationIndex(tmp_path), DestinationIndex(tmp_path)
+    first.prepare(["doe_john"])
+    second.prepare(["doe_john"])
+    a = first.reserve("doe_john", "letter.pdf")
+    b = second.reserve("doe_john", "letter.pdf")
+    c = first.reserve("doe_john", "letter.pdf")
+    assert len({a, b, c}) == 3
+    assert all(path.exists() for path in (a, b, c))
+
+
+def test_dry_run_reservations_write_nothing(tmp_path):
+    index = DestinationIndex(tmp_path)
+    target = index.reserve("doe_john", "letter.pdf", create=False)
+    assert target.name == "letter.pdf"
+    assert not (tmp_path / "doe_john").exists()
+    assert index.reserve("doe_john", "letter.pdf", create=False).name == "letter_1.pdf"
+
+
+def test_link_or_copy_replaces_claimed_placeholders(tmp_path):
+    source = tmp_path / "src.txt"
+    source.write_text("joint filing")
+    index = DestinationIndex(tmp_path)
+    targets = [index.reserve("doe_john", "src.txt"), index.reserve("roe_jane", "src.txt")]
+    link_or_copy(source, targets)
+    assert all(target.read_text() == "joint filing" for target in targets)
+    assert sorted(p.name for p in (tmp_path / "roe_jane").iterdir()) == ["src.txt"]
+
+
+def test_failed_link_keeps_the_filed_copies_and_reports_a_partial_error(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("John Doe, Jane Roe and Max Poe")
+    clients = [Client("john", "", "doe"), Client("jane", "", "roe"), Client("max", "", "poe")]
+
+    def link_then_fail(source, targets):
+        # The first extra client is linked; the second one fails.
+        os.unlink(targets[0])
+        os.link(source, targets[0])
+        raise OSError("disk full")
+
+    monkeypatch.setattr(organizer, "link_or_copy", link_then_fail)
+    stats = run_organization_task({
+        'src_path': src, 'dest_path': tmp_path / "dest", 'clients_list': clients, 'do_move': True,
+        'multi_client': True, 'sandbox_extraction': False, 'report_path': tmp_path / "report.jsonl",
+    })
+    (row,) = [json.loads(line) for line in (tmp_path / "report.jsonl").read_text().splitlines()]
+    assert row['status'] == "CONTENT" and stats['ERROR'] == 0
+    target = tmp_path / "dest" / row['target']
+    assert target.read_text() == "John Doe, Jane Roe and Max Poe"
+    filed = sorted(path.parent.name for path in (tmp_path / "dest").glob("*/a.txt"))
+    assert len(filed) == 2 and target.parent.name in filed
+    (missing,) = {"doe_john", "roe_jane", "poe_max"} - set(filed)
+    assert row['error'] == f"not filed under {missing}: disk full"
+    assert not (src / "a.txt").exists()
@@ -0,0 +1,169 @@
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from email.message import EmailMessage
+
+import Fileorganizer_python as organizer
+from Fileorganizer_python import (Client, EmlAttachmentCache, ExtractionCache, ScanSnapshot, collect_file_entries,
+                                  collect_files, discover_files, read_entry_bytes, run_organization_task)
+
+
+def test_collect_files_walks_nested_directories(tmp_path):
+    deep = tmp_path / "a" / "b" / "c"
+    deep.mkdir(parents=True)
+    (tmp_path / "top.pdf").write_bytes(b"%PDF")
+    (deep / "deep.TXT").write_text("x")
+    (deep / "skip.exe").write_bytes(b"MZ")
+    found = sorted(path.name for path in collect_files(tmp_path))
+    assert found == ["deep.TXT", "top.pdf"]
+
+
+def test_entries_carry_size_and_mtime(tmp_path):
+    (tmp_path / "a.txt").write_text("hello")
+    (entry,) = collect_file_entries(tmp_path)
+    assert entry.size == 5
+    assert entry.mtime == (tmp_path / "a.txt").stat().st_mtime
+    assert entry.member is None
+
+
+def test_zip_members_become_virtual_entries(tmp_path):
+    with zipfile.ZipFile(tmp_path / "bundle.zip", "w") as zf:
+        zf.writestr("docs/letter.txt", "John Doe")
+        zf.writestr("image.bmp", "x")
+    entries = collect_file_entries(tmp_path)
+    assert [(entry.path.name, entry.member) for entry in entries] == [("bundle.zip", "docs/letter.txt")]
+    assert collect_file_entries(tmp_path, archives=False) == []
+
+
+def write_eml(path, attachments):
+    message = EmailMessage()
+    message["Subject"] = "Production"
+    message.set_content("See attached.")
+    for name, data in attachments.items():
+        message.add_attachment(data, maintype="application", subtype="octet-stream", filename=name)
+    path.write_bytes(bytes(message))
+
+
+def test_eml_attachments_are_sized_without_decoding(tmp_path):
+    attachments = {"a.txt": b"John Doe " * 1000, "b.pdf": bytes(range(256)) * 7, "c.bmp": b"x"}
+    write_eml(tmp_path / "mail.eml", attachments)
+    entries = collect_file_entries(tmp_path)
+    assert [(entry.member, entry.size) for entry in entries] == [
+        ("0/a.txt", len(attachments["a.txt"])), ("1/b.pdf", len(attachments["b.pdf"]))]
+
+
+def test_eml_is_parsed_once_for_all_its_attachments(tmp_path):
+    attachments = {f"doc{i}.txt": f"attachment {i}".encode() for i in range(5)}
+    write_eml(tmp_path / "mail.eml", attachments)
+    cache = EmlAttachmentCache()
+    entries = collect_file_entries(tmp_path)
+    assert [read_entry_bytes(entry, cache) for entry in reversed(entries)] == list(reversed(attachments.values()))
+    assert cache.parses == 1
+    assert cache.bytes == 0
+    assert read_entry_bytes(entries[0], cache) == b"attachment 0"
+    assert cache.parses == 2
+    # Attachments that were already handed out are not cached again.
+    assert cache.bytes == 0
+
+
+def test_concurrent_reads_of_one_eml_parse_it_once(tmp_path, monkeypatch):
+    attachments = {f"doc{i}.txt": f"attachment {i}".encode() for i in range(4)}
+    write_eml(tmp_path / "mail.eml", attachments)
+    entries = collect_file_entries(tmp_path)
+    eml_document_payloads = organizer._eml_document_payloads
+
+    def slow_payloads(path):
+        time.sleep(0.2)
+        return eml_document_payloads(path)
+
+    monkeypatch.setattr(organizer, "_eml_document_payloads", slow_payloads)
+    cache = EmlAttachmentCache()
+    with ThreadPoolExecutor(len(entries)) as executor:
+        payloads = list(executor.map(lambda entry: read_entry_bytes(entry, cache), entries))
+    assert payloads == list(attachments.values())
+    assert cache.parses == 1
+    assert cache.bytes == 0
+
+
+def test_parallel_discovery_finds_the_same_files(tmp_path):
+    for i in range(5):
+        sub = tmp_path / f"d{i}" / "x"
+        sub.mkdir(parents=True)
+        (sub / f"f{i}.docx").write_bytes(b"PK")
+    (tmp_path / "root.txt").write_text("r")
+    with ThreadPoolExecutor(3) as executor:
+        parallel = discover_files(tmp_path, executor)
+    assert sorted(parallel) == sorted(collect_file_entries(tmp_path))
+
+
+def make_tree(root, old=True):
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("John Doe")
+    (root / "sub" / "b.txt").write_text("Jane Roe")
+    if old:
+        # Directories last modified well before the snapshot, outside the mtime granularity window.
+        past = time.time() - 60
+        for directory in (root / "sub", root):
+            os.utime(directory, (past, past))
+
+
+def rescan(src, snapshot_dir, full_rescan=False):
+    snapshot = ScanSnapshot(src, snapshot_dir, full_rescan)
+    with ThreadPoolExecutor(2) as executor:
+        entries = discover_files(src, executor, snapshot=snapshot)
+    snapshot.save()
+    return snapshot, sorted(entries)
+
+
+def test_unchanged_directories_are_reused(tmp_path):
+    src = tmp_path / "src"
+    make_tree(src)
+    first, entries = rescan(src, tmp_path / "scans")
+    assert (first.listed, first.reused) == (2, 0)
+    second, again = rescan(src, tmp_path / "scans")
+    assert (second.listed, second.reused) == (0, 2)
+    assert again == entries
+
+
+def test_changed_directory_is_listed_again(tmp_path):
+    src = tmp_path / "src"
+    make_tree(src)
+    rescan(src, tmp_path / "scans")
+    (src / "sub" / "c.txt").write_text("new")
+    snapshot, entries = rescan(src, tmp_path / "scans")
+    assert (snapshot.listed, snapshot.reused) == (1, 1)
+    assert [entry.path.name for entry in entries] == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_full_rescan_ignores_the_snapshot(tmp_path):
+    src = tmp_path / "src"
+    make_tree(src)
+    rescan(src, tmp_path / "scans")
+    snapshot, _ = rescan(src, tmp_path / "scans", full_rescan=True)
+    assert (snapshot.listed, snapshot.reused) == (2, 0)
+
+
+def test_recently_modified_directories_are_listed_again(tmp_path):
+    src = tmp_path / "src"
+    make_tree(src, old=False)
+    rescan(src, tmp_path / "scans")
+    snapshot, _ = rescan(src, tmp_path / "scans")
+    assert (snapshot.listed, snapshot.reused) == (2, 0)
+
+
+def test_reused_listings_do_not_serve_stale_cached_text(tmp_path):
+    src = tmp_path / "src"
+    make_tree(src)
+    cache = ExtractionCache()
+    config = {'src_path': src, 'clients_list': [Client("john", "", "doe"), Client("jane", "", "roe")],
+              'do_move': False, 'incremental_scan': True, 'scan_snapshot_dir': tmp_path / "scans",
+              'extraction_cache': cache, 'precreate_folders': False}
+    run_organization_task(dict(config, dest_path=tmp_path / "first"))
+    # Rewrite a.txt in place: its directory's mtime stays the same, so the listing is reused.
+    mtime = (src / "a.txt").stat().st_mtime
+    (src / "a.txt").write_text("Jane Roe")
+    os.utime(src / "a.txt", (mtime + 5, mtime + 5))
+    run_organization_task(dict(config, dest_path=tmp_path / "second"))
+    assert (tmp_path / "second" / "roe_jane" / "a.txt").read_text() == "Jane Roe"
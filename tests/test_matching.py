@@ -0,0 +1,139 @@
+import pytest
+
+import Fileorganizer_python as organizer
+from Fileorganizer_python import Client, ClientRegistry, find_client_match, find_client_matches, match_client_ids
+
+from conftest import make_clients, make_text
+
+DOE = Client("john", "", "doe")
+ROE = Client("jane", "", "roe")
+
+
+def test_matches_first_and_last_name():
+    assert find_client_match("Letter to John Doe re: lease", None, [DOE, ROE]) == DOE
+    assert find_client_match("DOE, JOHN - deposition", None, [DOE, ROE]) == DOE
+
+
+def test_requires_both_names():
+    assert find_client_match("John Smith", None, [DOE]) is None
+    assert find_client_match("Mr. Doe", None, [DOE]) is None
+
+
+def test_whole_words_only():
+    assert find_client_match("Johnson Doerr", None, [DOE]) is None
+    assert find_client_match("john-doe@example.com", None, [DOE]) == DOE
+
+
+def test_accents_case_and_apostrophes_are_folded():
+    client = Client("josé", "", "o'brien")
+    assert find_client_match("Counsel for JOSE OBRIEN", None, [client]) == client
+    assert find_client_match("José O’Brien", None, [client]) == client
+
+
+def test_possessives_match_the_plain_name():
+    smith = Client("john", "", "smith")
+    assert find_client_match("Plaintiff John Smith's claims", None, [smith]) == smith
+    assert find_client_match("JOHN SMITH’S motion", None, [smith]) == smith
+    assert find_client_match("re: John's appeal (Smith)", None, [smith]) == smith
+    obrien = Client("josé", "", "o'brien")
+    assert find_client_match("José O'Brien's deposition", None, [obrien]) == obrien
+    assert find_client_match("John Smiths", None, [smith]) is None
+
+
+def test_multi_word_and_hyphenated_names():
+    client = Client("mary ann", "", "smith-jones")
+    assert find_client_match("Mary Ann Smith Jones", None, [client]) == client
+    assert find_client_match("MaryAnn? no: Mary Ann SmithJones", None, [client]) == client
+
+
+def test_aliases_stand_in_for_names():
+    registry = ClientRegistry([Client("william", "", "gates")], {"william": ["bill"]})
+    assert organizer.match_client_id("Bill Gates", None, registry) == 0
+
+
+@pytest.mark.parametrize("overlap_words, matched", [(None, True), (0, False)])
+def test_names_split_across_chunks_still_match(monkeypatch, overlap_words, matched):
+    client = Client("mary ann", "", "smith")
+    text = "x " * 20 + "Mary Ann Smith"
+    # With 46-character chunks the first cut falls between "Mary" and "Ann".
+    chunk_size = 46
+    assert [chunk.split() for chunk in organizer.iter_normalized_chunks(text, 0, chunk_size)][:2] == [
+        ["x"] * 20 + ["mary"], ["ann", "smith"]]
+    iter_normalized_chunks = organizer.iter_normalized_chunks
+
+    def small_chunks(text, overlap=0):
+        # None keeps the overlap the matcher asks for; 0 shows that it is what finds the name.
+        return iter_normalized_chunks(text, overlap if overlap_words is None else overlap_words, chunk_size)
+
+    monkeypatch.setattr(organizer, "iter_normalized_chunks", small_chunks)
+    assert find_client_match(text, None, [client]) == (client if matched else None)
+
+
+@pytest.mark.parametrize("first, last", [
+    ("j.r.", "smith"),
+    ("a+b", "c*d"),
+    ("(ann)", "[lee]"),
+    ("o'neil?", "^doe$"),
+    ("back\\slash", "pipe|name"),
+])
+def test_regex_metacharacters_in_names(first, last):
+    client = Client(first, "", last)
+    text = f"Filed on behalf of {first} {last} today"
+    assert find_client_match(text, None, [client]) == client
+    assert find_client_match("Filed on behalf of nobody today", None, [client]) is None
+
+
+def test_first_matching_client_wins():
+    assert find_client_match("Jane Roe and John Doe", None, [DOE, ROE]) == ROE
+
+
+def test_all_matching_clients_are_reported_once():
+    text = "Jane Roe and John Doe; John Doe again"
+    assert find_client_matches(text, None, [DOE, ROE]) == [ROE, DOE]
+    assert match_client_ids("nobody", None, ClientRegistry([DOE])) == []
+
+
+def test_plain_client_lists_reuse_their_registry():
+    clients = [DOE, ROE]
+    assert organizer.as_registry(clients) is organizer.as_registry(list(clients))
+    assert organizer.as_registry([ROE]) is not organizer.as_registry(clients)
+
+
+def test_registry_pickles_round_trip():
+    import pickle
+    registry = ClientRegistry([DOE, ROE], {"john": ["jack"]})
+    restored = pickle.loads(pickle.dumps(registry))
+    assert restored.clients == registry.clients
+    assert organizer.match_client_id("Jack Doe", None, restored) == 0
+
+
+def test_automaton_and_token_index_agree():
+    pytest.importorskip("ahocorasick")
+    clients = make_clients(300, seed=3) + [Client("mary ann", "", "smith-jones"), Client("josé", "", "o'brien")]
+    registry = ClientRegistry(clients, {"mary ann": ["maryann"]})
+    automaton = organizer.build_automaton(registry)
+    assert automaton is not None
+    samples = [make_text(20000, seed, names=[f"{c.first} {c.last}" for c in clients[seed::37]])
+               for seed in range(10)]
+    samples += ["Mary Ann Smith-Jones", "MaryAnn SmithJones", "José O'Brien", "smith jones mary", ""]
+    for text in samples:
+        assert set(match_client_ids(text, automaton, registry)) == set(match_client_ids(text, None, registry))
+        assert (organizer.match_client_id(text, automaton, registry) is None) == \
+            (organizer.match_client_id(text, None, registry) is None)
+
+
+def test_masks_carry_name_parts_across_regions():
+    registry = ClientRegistry([DOE])
+    masks = {}
+    assert organizer.match_client_id("Dear John,", None, registry, masks) is None
+    assert organizer.match_client_id("regards, Mr. Doe", None, registry, masks) == 0
+
+
+def test_text_regions_split_at_whitespace():
+    data = b"Re: John Doe " + b"word " * 1000
+    (head,) = organizer.extract_regions(data, ".txt", "head", {"text_kb": 1})
+    (body,) = organizer.extract_regions(data, ".txt", "body", {"text_kb": 1})
+    assert head[0] == "opening" and body[0] == "body"
+    assert head[1].startswith("Re: John Doe") and len(head[1]) <= 1024
+    assert (head[1] + body[1]).encode() == data
+    assert organizer.extract_regions(b"short", ".txt", "body") == []
@@ -0,0 +1,96 @@
+"""Throughput tests; budgets in perf_budgets.json are multiples of the calibration loop in conftest."""
+import pytest
+
+import Fileorganizer_python as organizer
+from Fileorganizer_python import ClientRegistry, DestinationIndex, collect_files, get_unique_filepath
+
+from conftest import make_clients, make_text
+
+pytestmark = pytest.mark.perf
+
+TEXT_MB = 2
+CLIENTS = 2000
+COLLISIONS = 300
+TREE_DEPTH = 6
+TREE_FANOUT = 3
+FILES_PER_DIR = 4
+
+
+@pytest.fixture(scope="module")
+def clients():
+    return make_clients(CLIENTS, seed=1)
+
+
+@pytest.fixture(scope="module")
+def document(clients):
+    last = clients[-1]
+    return make_text(TEXT_MB * 1024 * 1024, seed=2, names=[f"{last.first} {last.last}"])
+
+
+def test_build_registry(perf_budget, clients):
+    perf_budget("build_registry", lambda: ClientRegistry(clients))
+
+
+def test_match_text_token_index(perf_budget, clients, document):
+    registry = ClientRegistry(clients)
+    assert organizer.match_client_id(document, None, registry) == len(clients) - 1
+    perf_budget("match_text_token_index", lambda: organizer.match_client_id(document, None, registry))
+
+
+def test_match_text_automaton(perf_budget, clients, document):
+    pytest.importorskip("ahocorasick")
+    registry = ClientRegistry(clients)
+    automaton = organizer.build_automaton(registry)
+    assert organizer.match_client_id(document, automaton, registry) == len(clients) - 1
+    perf_budget("match_text_automaton", lambda: organizer.match_client_id(document, automaton, registry))
+
+
+def test_unique_filepath_collisions(perf_budget, tmp_path):
+    for i in range(COLLISIONS):
+        (tmp_path / (f"scan_{i}.pdf" if i else "scan.pdf")).touch()
+
+    def allocate():
+        assert get_unique_filepath(tmp_path, "scan.pdf").name == f"scan_{COLLISIONS}.pdf"
+
+    perf_budget("unique_filepath_collisions", allocate)
+
+
+def test_destination_index_collisions(perf_budget, tmp_path):
+    repeats = iter(range(3))
+
+    def fresh_destination():
+        # reserve() claims each name on disk, so every timed run needs its own folder.
+        dest = tmp_path / f"run{next(repeats)}"
+        folder = dest / "doe_john"
+        folder.mkdir(parents=True)
+        for i in range(COLLISIONS):
+            (folder / (f"scan_{i}.pdf" if i else "scan.pdf")).touch()
+        return dest
+
+    def allocate(dest):
+        index = DestinationIndex(dest)
+        for _ in range(COLLISIONS):
+            index.reserve("doe_john", "scan.pdf")
+
+    perf_budget("destination_index_collisions", allocate, setup=fresh_destination)
+
+
+def test_discovery_deep_tree(perf_budget, tmp_path):
+    expected = 0
+    level = [tmp_path]
+    for _ in range(TREE_DEPTH):
+        next_level = []
+        for directory in level:
+            for i in range(FILES_PER_DIR):
+                (directory / f"doc{i}.{'pdf' if i % 2 else 'txt'}").touch()
+                expected += 1
+            for i in range(TREE_FANOUT):
+                sub = directory / f"sub{i}"
+                sub.mkdir()
+                next_level.append(sub)
+        level = next_level
+
+    def walk():
+        assert len(collect_files(tmp_path)) == expected
+
+    perf_budget("discovery_deep_tree", walk)
@@ -0,0 +1,37 @@
+import Fileorganizer_python as organizer
+
+
+def _parser_samples(profiler):
+    return sum(row['total'] for row in profiler.to_dict()['functions']
+               if row['function'].startswith("_extract_txt ("))
+
+
+def test_sandbox_parsing_is_merged_into_the_run_profile():
+    profiler = organizer.SamplingProfiler(0.001)
+    sandbox = organizer.ExtractionSandbox(1)
+    sandbox.profiler = profiler
+    data = ("John Doe é " * 4_000_000).encode()
+    try:
+        # The parse runs in the worker process, so its frames only reach this profiler through merge().
+        for _ in range(20):
+            assert "John Doe" in sandbox.extract(data, ".txt")
+            if _parser_samples(profiler):
+                break
+    finally:
+        sandbox.close()
+    assert _parser_samples(profiler) > 0
+
+
+def test_drained_samples_merge_into_another_profiler():
+    worker = organizer.SamplingProfiler()
+    worker.samples, worker.idle = 3, 1
+    worker.self_counts.update({"parse (a.py:1)": 2})
+    worker.total_counts.update({"parse (a.py:1)": 2, "main (a.py:9)": 2})
+    worker.stacks.update({"main (a.py:9);parse (a.py:1)": 2})
+    run = organizer.SamplingProfiler()
+    run.merge(worker.drain())
+    run.merge(worker.drain())
+    profile = run.to_dict()
+    assert (profile['samples'], profile['idle_samples']) == (3, 1)
+    assert {'function': "parse (a.py:1)", 'self': 2, 'total': 2} in profile['functions']
+    assert profile['stacks'] == {"main (a.py:9);parse (a.py:1)": 2}
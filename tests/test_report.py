@@ -0,0 +1,49 @@
+import pytest
+
+from Fileorganizer_python import REPORT_FIELDS, ReportIndex, RunReport
+
+
+def record(i, **fields):
+    row = dict.fromkeys(REPORT_FIELDS, "")
+    row.update(source=f"/src/file{i}.txt", status="COPIED", size=str(i), **fields)
+    return row
+
+
+def write_report(path, records):
+    report = RunReport(path)
+    for row in records:
+        report.add(row)
+    report.close()
+    return report
+
+
+@pytest.mark.parametrize("name", ["run.csv", "run.jsonl"])
+def test_report_round_trips(tmp_path, name):
+    records = [record(i, clients="doe_john|roe_jane", error='bad "quote", comma') for i in range(5)]
+    report = write_report(tmp_path / name, records)
+    index = ReportIndex(tmp_path / name)
+    assert report.records == len(index) == 5
+    assert index.page(0, 10) == records
+
+
+@pytest.mark.parametrize("name", ["run.csv", "run.jsonl"])
+def test_pages_are_read_by_position(tmp_path, name):
+    records = [record(i) for i in range(25)]
+    write_report(tmp_path / name, records)
+    index = ReportIndex(tmp_path / name)
+    assert index.page(10, 10) == records[10:20]
+    assert index.page(20, 10) == records[20:]
+    assert index.page(25, 10) == []
+
+
+@pytest.mark.parametrize("name", ["run.csv", "run.jsonl"])
+def test_newlines_in_fields_do_not_split_records(tmp_path, name):
+    records = [record(0, error="line one\nline two\r\nthree"), record(1)]
+    write_report(tmp_path / name, records)
+    index = ReportIndex(tmp_path / name)
+    assert len(index) == 2
+    first, second = index.page(0, 2)
+    # JSON escapes the newlines; CSV reports flatten them so each record stays on one line.
+    expected = "line one\nline two\r\nthree" if name.endswith(".jsonl") else "line one line two  three"
+    assert first['error'] == expected
+    assert second == records[1]
@@ -0,0 +1,95 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from Fileorganizer_service import OrganizerService, ServiceClient, make_server
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def server():
+    server = make_server("127.0.0.1", 0, OrganizerService(), token=TOKEN)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None, **headers):
+    headers = {'Authorization': f"Bearer {TOKEN}", 'Content-Type': 'application/json', **headers}
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body)
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    status, payload = response.status, json.loads(response.read() or b'{}')
+    connection.close()
+    return status, payload
+
+
+def job(tmp_path, **options):
+    return dict({'src_path': str(tmp_path), 'dest_path': str(tmp_path / "dest"), 'dry_run': True,
+                 'clients': [["john", "", "doe"]]}, **options)
+
+
+def test_health_requires_the_token(server):
+    assert request(server, "GET", "/health")[0] == 200
+    assert request(server, "GET", "/health", Authorization="Bearer wrong")[0] == 401
+    assert request(server, "GET", "/health", Authorization="")[0] == 401
+
+
+@pytest.mark.parametrize("headers", [{'Host': "evil.example"}, {'Host': "evil.example:8765"},
+                                     {'Origin': "http://evil.example"}, {'Origin': "null"}])
+def test_foreign_host_or_origin_is_refused(server, tmp_path, headers):
+    assert request(server, "POST", "/jobs", job(tmp_path), **headers)[0] == 403
+
+
+def test_local_origin_is_allowed(server):
+    port = server.server_address[1]
+    assert request(server, "GET", "/health", Origin=f"http://localhost:{port}")[0] == 200
+
+
+def test_posts_must_be_json(server, tmp_path):
+    assert request(server, "POST", "/jobs", job(tmp_path), **{'Content-Type': "text/plain"})[0] == 415
+
+
+@pytest.mark.parametrize("body, message", [
+    ("not json", "Expecting value"),
+    ([1, 2], "JSON object"),
+    ({'dest_path': "/d"}, "required"),
+    ({'src_path': "/s", 'dest_path': "/d", 'clients': [["john", "doe"]]}, "clients"),
+    ({'src_path': "/s", 'dest_path': "/d", 'clients': "john doe"}, "clients"),
+    ({'src_path': "/s", 'dest_path': "/d", 'aliases': {"william": "bill"}}, "aliases"),
+    ({'src_path': "/s", 'dest_path': "/d", 'read_workers': "8"}, "read_workers"),
+    ({'src_path': "/s", 'dest_path': "/d", 'report_path': "/etc/passwd"}, "unknown options"),
+    ({'src_path': "/s", 'dest_path': "/d", 'profile': "/tmp/p.json"}, "profile"),
+])
+def test_malformed_jobs_are_refused_before_queueing(server, body, message):
+    status, payload = request(server, "POST", "/jobs", body)
+    assert status == 400
+    assert message in payload['error']
+    assert request(server, "GET", "/jobs")[1]['jobs'] == []
+
+
+@pytest.mark.parametrize("query", ["since=abc", "wait=x", "since=-1", "wait=nan"])
+def test_bad_event_queries_are_refused(server, tmp_path, query):
+    job_id = request(server, "POST", "/jobs", job(tmp_path))[1]['id']
+    assert request(server, "GET", f"/jobs/{job_id}/events?{query}")[0] == 400
+
+
+def test_client_submits_and_follows_a_job(server, tmp_path):
+    (tmp_path / "a.txt").write_text("John Doe")
+    client = ServiceClient(f"http://127.0.0.1:{server.server_address[1]}", token=TOKEN)
+    job_id = client.submit(job(tmp_path, report=True))['id']
+    since = 0
+    while True:
+        response = client.events(job_id, since, wait=5)
+        since = response['next']
+        if response['state'] in ("done", "failed", "cancelled"):
+            break
+    assert response['state'] == "done"
+    assert response['stats']['CONTENT'] == 1
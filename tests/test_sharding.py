@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+from Fileorganizer_python import (Client, claim_shard, create_shard_queue, merge_shard_results, read_plan,
+                                  reclaim_stale_leases, run_shard_worker)
+
+
+def make_queue(tmp_path, count=3):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(count):
+        (src / f"f{i}.txt").write_text(f"John Doe {i}")
+    config = {'src_path': src, 'dest_path': tmp_path / "dest", 'do_move': False,
+              'clients_list': [Client("john", "", "doe")]}
+    queue = tmp_path / "queue"
+    create_shard_queue(config, queue, shard_size=1)
+    return queue
+
+
+def test_fresh_claim_is_not_reclaimed_as_stale(tmp_path):
+    queue = make_queue(tmp_path)
+    for manifest in (queue / "pending").iterdir():
+        os.utime(manifest, (1, 1))
+    lease = claim_shard(queue, "w1")
+    assert lease is not None
+    assert reclaim_stale_leases(queue, lease_timeout=60) == 0
+    assert lease.exists()
+
+
+def test_expired_lease_returns_to_pending(tmp_path):
+    queue = make_queue(tmp_path, count=1)
+    lease = claim_shard(queue, "w1")
+    os.utime(lease, (1, 1))
+    assert reclaim_stale_leases(queue, lease_timeout=60) == 1
+    assert claim_shard(queue, "w2").name == lease.name.replace("@w1", "@w2")
+
+
+def test_dry_run_shards_write_separate_plans_that_merge(tmp_path):
+    queue = make_queue(tmp_path, count=4)
+    job = queue / "job.json"
+    job.write_text(job.read_text().replace('"dry_run": false', '"dry_run": true'))
+    run_shard_worker(queue, "w1")
+    summary = merge_shard_results(queue)
+    assert len(list((queue / "plans").iterdir())) == 4
+    rows = list(read_plan(summary['plan_path']))
+    assert [Path(row.source).name for row in rows] == ["f0.txt", "f1.txt", "f2.txt", "f3.txt"]
+    assert not (tmp_path / "dest").exists()
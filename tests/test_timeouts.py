@@ -0,0 +1,108 @@
+import threading
+import time
+
+import Fileorganizer_python as organizer
+from Fileorganizer_python import Client, run_organization_task
+
+
+def test_timed_out_read_keeps_its_memory_reserved_until_it_returns(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    # Each file's estimate exceeds the 1 MB budget, so the second can only be read once the first is released.
+    (src / "slow.txt").write_text("x" * 600_000)
+    (src / "next.txt").write_text("y" * 500_000)
+    events = []
+    read_entry_bytes = organizer.read_entry_bytes
+
+    def hanging_read(entry, eml_cache=None):
+        if entry.path.name == "slow.txt":
+            time.sleep(0.5)
+            events.append("slow read returned")
+        else:
+            events.append("next read started")
+        return read_entry_bytes(entry, eml_cache)
+
+    monkeypatch.setattr(organizer, "read_entry_bytes", hanging_read)
+    stats = run_organization_task({
+        'src_path': src, 'dest_path': tmp_path / "dest", 'clients_list': [Client("john", "", "doe")],
+        'do_move': False, 'file_timeout': 0.1, 'memory_budget_mb': 1, 'read_workers': 2,
+        'sandbox_extraction': False,
+    })
+    assert stats['TIMEOUT'] == 1
+    assert events == ["slow read returned", "next read started"]
+
+
+def test_run_reports_reads_still_running_at_the_end(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "stuck.txt").write_text("John Doe")
+    release = threading.Event()
+    monkeypatch.setattr(organizer, "read_entry_bytes", lambda entry, eml_cache=None: release.wait(5) and b"")
+    logs = []
+    try:
+        stats = run_organization_task({
+            'src_path': src, 'dest_path': tmp_path / "dest", 'clients_list': [Client("john", "", "doe")],
+            'do_move': False, 'file_timeout': 0.1, 'sandbox_extraction': False,
+            'log_callback': lambda msg, cat='info': logs.append(msg),
+        })
+    finally:
+        release.set()
+    assert stats['TIMEOUT'] == 1
+    assert any("still being read in the background" in msg for msg in logs)
+
+
+def test_reads_that_return_after_their_worker_moved_on_are_not_reported_as_stuck(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "stuck-1.txt").write_text("x" * 100_000)
+    (src / "stuck-2.txt").write_text("x" * 100_000)
+    (src / "John Doe.txt").write_text("")
+    returned = threading.Event()
+    read_entry_bytes = organizer.read_entry_bytes
+    transfer_stage = organizer._OrganizationRun.transfer_stage
+
+    def stuck_read(entry, eml_cache=None):
+        if entry.path.name.startswith("stuck"):
+            returned.wait(5)
+        return read_entry_bytes(entry, eml_cache)
+
+    def transfer(self, job):
+        # Both reads have timed out by now; once they return, their workers are done with them.
+        time.sleep(0.3)
+        returned.set()
+        time.sleep(0.3)
+        return transfer_stage(self, job)
+
+    monkeypatch.setattr(organizer, "read_entry_bytes", stuck_read)
+    monkeypatch.setattr(organizer._OrganizationRun, "transfer_stage", transfer)
+    logs = []
+    stats = run_organization_task({
+        'src_path': src, 'dest_path': tmp_path / "dest", 'clients_list': [Client("john", "", "doe")],
+        'do_move': False, 'file_timeout': 0.1, 'read_workers': 3, 'sandbox_extraction': False,
+        'log_callback': lambda msg, cat='info': logs.append(msg),
+    })
+    assert stats['TIMEOUT'] == 2
+    assert not any("still being read in the background" in msg for msg in logs)
+
+
+def test_parse_ended_by_closing_the_sandbox_is_neither_quarantined_nor_stuck(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "hangs.pdf").write_bytes(b"%PDF-1.4")
+    closed = threading.Event()
+
+    def hanging_extract(self, data, ext, part=None, region_limits=None):
+        closed.wait(5)
+        raise organizer.ExtractionSandboxError("parser process crashed (OSError)")
+
+    monkeypatch.setattr(organizer.ExtractionSandbox, "extract", hanging_extract)
+    monkeypatch.setattr(organizer.ExtractionSandbox, "close", lambda self: closed.set())
+    logs = []
+    stats = run_organization_task({
+        'src_path': src, 'dest_path': tmp_path / "dest", 'clients_list': [Client("john", "", "doe")],
+        'do_move': False, 'file_timeout': 0.1, 'sandbox_extraction': True,
+        'log_callback': lambda msg, cat='info': logs.append(msg),
+    })
+    assert stats['TIMEOUT'] == 1
+    assert not any("[QUARANTINED]" in msg for msg in logs)
+    assert not any("still being read in the background" in msg for msg in logs)